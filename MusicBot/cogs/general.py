@@ -1,18 +1,26 @@
 import logging
 from typing import Literal
-from asyncio import gather
 
 import discord
 from discord.ext.commands import Cog
 
+from yandex_music import ClientAsync as YMClient, Track
 from yandex_music.exceptions import UnauthorizedError
-from yandex_music import ClientAsync as YMClient
 
 from MusicBot.ui import ListenView
 from MusicBot.database import BaseUsersDatabase
 from MusicBot.cogs.utils import BaseBot, generate_item_embed
+from MusicBot.cogs.utils.autocomplete import AutocompleteEngine
 
 users_db = BaseUsersDatabase()
+autocomplete = AutocompleteEngine()
+
+SEARCH_CONTENT_TYPES: dict[str, Literal['track', 'album', 'artist', 'playlist']] = {
+    'Трек': 'track',
+    'Альбом': 'album',
+    'Артист': 'artist',
+    'Плейлист': 'playlist'
+}
 
 def setup(bot):
     bot.add_cog(General(bot))
@@ -22,63 +30,73 @@ async def get_search_suggestions(ctx: discord.AutocompleteContext) -> list[str]:
         return []
 
     uid = ctx.interaction.user.id
-    if not (token := await users_db.get_ym_token(uid)):
-        logging.info(f"[GENERAL] User {uid} has no token")
+    if (content_type := ctx.options['тип']) not in SEARCH_CONTENT_TYPES:
+        logging.error(f"[GENERAL] Invalid content type '{content_type}' for user {uid}")
         return []
 
-    try:
-        client = await YMClient(token).init()
-    except UnauthorizedError:
-        logging.info(f"[GENERAL] User {uid} provided invalid token")
-        return []
+    res = await autocomplete.suggest(
+        (uid, 'search', content_type),
+        ctx.value,
+        lambda value: _fetch_search_suggestions(uid, content_type, value)
+    )
+    return res[:100]
 
-    if not (search := await client.search(ctx.value)):
-        logging.warning(f"[GENERAL] Failed to search for '{ctx.value}' for user {uid}")
-        return []
+async def _fetch_search_suggestions(uid: int, content_type: str, value: str) -> list[str] | None:
+    if not (client := await _get_autocomplete_client(uid)):
+        return None
 
-    logging.debug(f"[GENERAL] Searching for '{ctx.value}' for user {uid}")
+    logging.debug(f"[GENERAL] Searching for '{value}' for user {uid}")
 
-    if (content_type := ctx.options['тип']) not in ('Трек', 'Альбом', 'Артист', 'Плейлист'):
-        logging.error(f"[GENERAL] Invalid content type '{content_type}' for user {uid}")
-        return []
+    if (results := await BaseBot.search(client, value, SEARCH_CONTENT_TYPES[content_type])) is None:
+        logging.warning(f"[GENERAL] Failed to search for '{value}' for user {uid}")
+        return None
 
-    if content_type == 'Трек' and search.tracks is not None:
-        res = [f"{item.title} {f"({item.version})" if item.version else ''} - {", ".join(item.artists_name())}" for item in search.tracks.results]
-    elif content_type == 'Альбом' and search.albums is not None:
-        res = [f"{item.title} - {", ".join(item.artists_name())}" for item in search.albums.results]
-    elif content_type == 'Артист' and search.artists is not None:
-        res = [f"{item.name}" for item in search.artists.results]
-    elif content_type == 'Плейлист' and search.playlists is not None:
-        res = [f"{item.title}" for item in search.playlists.results]
+    if content_type == 'Трек':
+        return [f"{item.title} {f"({item.version})" if item.version else ''} - {", ".join(item.artists_name())}" for item in results]
+    elif content_type == 'Альбом':
+        return [f"{item.title} - {", ".join(item.artists_name())}" for item in results]
+    elif content_type == 'Артист':
+        return [f"{item.name}" for item in results]
     else:
-        logging.info(f"[GENERAL] Failed to get content type '{content_type}' with name '{ctx.value}' for user {uid}")
-        return []
-
-    return res[:100]
+        return [f"{item.title}" for item in results]
 
 async def get_user_playlists_suggestions(ctx: discord.AutocompleteContext) -> list[str]:
     if not ctx.interaction.user or not ctx.value or not (100 > len(ctx.value) > 2):
         return []
 
     uid = ctx.interaction.user.id
-    if not (token := await users_db.get_ym_token(uid)):
-        logging.info(f"[GENERAL] User {uid} has no token")
-        return []
+    res = await autocomplete.suggest(
+        (uid, 'playlists'),
+        ctx.value,
+        lambda value: _fetch_user_playlists_suggestions(uid, value),
+        exhaustive=True
+    )
+    return res[:100]
 
-    try:
-        client = await YMClient(token).init()
-    except UnauthorizedError:
-        logging.info(f"[GENERAL] User {uid} provided invalid token")
-        return []
+async def _fetch_user_playlists_suggestions(uid: int, value: str) -> list[str] | None:
+    if not (client := await _get_autocomplete_client(uid)):
+        return None
 
-    logging.debug(f"[GENERAL] Searching for '{ctx.value}' for user {uid}")
+    logging.debug(f"[GENERAL] Searching for '{value}' for user {uid}")
     try:
-        playlists_list = await client.users_playlists_list()
+        playlists_list = await BaseBot._playlists.get_all(client) or []
     except Exception as e:
         logging.error(f"[GENERAL] Failed to get playlists for user {uid}: {e}")
-        return []
+        return None
+
+    query = value.casefold()
+    return [playlist.title for playlist in playlists_list if playlist.title and query in playlist.title.casefold()]
+
+async def _get_autocomplete_client(uid: int) -> YMClient | None:
+    if not (token := await users_db.get_ym_token(uid)):
+        logging.info(f"[GENERAL] User {uid} has no token")
+        return None
 
-    return [playlist.title for playlist in playlists_list if playlist.title and ctx.value in playlist.title][:100]
+    try:
+        return await BaseBot._ym_clients.get(token)
+    except UnauthorizedError:
+        logging.info(f"[GENERAL] User {uid} provided invalid token")
+        return None
 
 class General(Cog, BaseBot):
 
@@ -173,7 +191,7 @@ class General(Cog, BaseBot):
         logging.info(f"[GENERAL] Login command invoked by user {ctx.author.id} in guild {ctx.guild_id}")
 
         try:
-            client = await YMClient(token).init()
+            client = await self._ym_clients.get(token)
         except UnauthorizedError:
             logging.info(f"[GENERAL] Invalid token provided by user {ctx.author.id}")
             await self.respond(ctx, "error", "Недействительный токен.", delete_after=15, ephemeral=True)
@@ -186,8 +204,6 @@ class General(Cog, BaseBot):
 
         await self.users_db.update(ctx.author.id, {'ym_token': token})
         await self.respond(ctx, "success", f"Привет, {client.me.account.first_name}!", delete_after=15, ephemeral=True)
-
-        self._ym_clients[token] = client
         logging.info(f"[GENERAL] User {ctx.author.id} logged in successfully")
     
     @account.command(description="Удалить токен из базы данных бота.")
@@ -199,9 +215,7 @@ class General(Cog, BaseBot):
             await self.respond(ctx, "error", "Токен не указан.", delete_after=15, ephemeral=True)
             return
 
-        if token in self._ym_clients:
-            del self._ym_clients[token]
-
+        self._ym_clients.remove(token)
         await self.users_db.update(ctx.user.id, {'ym_token': None})
         logging.info(f"[GENERAL] Token removed for user {ctx.author.id}")
 
@@ -240,10 +254,26 @@ class General(Cog, BaseBot):
             return
 
         await ctx.defer()  # Sometimes it takes a while to fetch all tracks, so we defer the response
-        real_tracks = await gather(*[track_short.fetch_track_async() for track_short in likes.tracks], return_exceptions=True)
-        tracks = [track for track in real_tracks if not isinstance(track, BaseException)]  # Can't fetch user tracks
 
-        await ctx.respond(embed=await generate_item_embed(tracks), view=ListenView(tracks))
+        # The message is sent after the first chunk arrives. The view only keeps track ids.
+        track_ids = [track_short.track_id for track_short in likes.tracks]
+        tracks: list[Track] = []
+        message = None
+        sent_count = 0
+        async for chunk in self.fetch_tracks(client, track_ids):
+            tracks.extend(chunk)
+            if not message and tracks:
+                message = await ctx.respond(embed=await generate_item_embed(tracks), view=ListenView(track_ids, requester_id=ctx.user.id))
+                sent_count = len(tracks)
+
+        if not message:
+            logging.info(f"[GENERAL] Failed to fetch liked tracks for user {ctx.user.id}")
+            await self.respond(ctx, "error", "Не удалось получить треки.", delete_after=15, ephemeral=True)
+            return
+
+        if len(tracks) != sent_count:
+            await message.edit(embed=await generate_item_embed(tracks))
+
         logging.info(f"[GENERAL] Successfully generated likes message for user {ctx.user.id}")
     
     @account.command(description="Получить ваши рекомендации.")
@@ -285,7 +315,7 @@ class General(Cog, BaseBot):
             await self.respond(ctx, "error", "Пустой плейлист.", delete_after=15, ephemeral=True)
             return
 
-        await ctx.respond(embed=await generate_item_embed(playlist), view=ListenView(playlist))
+        await ctx.respond(embed=await generate_item_embed(playlist), view=ListenView(playlist, requester_id=ctx.user.id))
 
     @account.command(description="Получить ваш плейлист.")
     @discord.option(
@@ -323,7 +353,7 @@ class General(Cog, BaseBot):
             await self.respond(ctx, "error", "Плейлист пуст.", delete_after=15, ephemeral=True)
             return
 
-        await ctx.respond(embed=await generate_item_embed(playlist), view=ListenView(playlist))
+        await ctx.respond(embed=await generate_item_embed(playlist), view=ListenView(playlist, requester_id=ctx.user.id))
 
     @discord.slash_command(description="Найти контент и отправить информацию о нём. Возвращается лучшее совпадение.")
     @discord.option(
@@ -351,26 +381,17 @@ class General(Cog, BaseBot):
         if not (client := await self.init_ym_client(ctx)):
             return
 
-        if not (search_result := await client.search(name, nocorrect=True)):
+        if (results := await self.search(client, name, SEARCH_CONTENT_TYPES[content_type])) is None:
             logging.warning(f"Failed to search for '{name}' for user {ctx.user.id}")
             await self.respond(ctx, "error", "Что-то пошло не так. Повторите попытку позже.", delete_after=15, ephemeral=True)
             return
 
-        if content_type == 'Трек':
-            content = search_result.tracks
-        elif content_type == 'Альбом':
-            content = search_result.albums
-        elif content_type == 'Артист':
-            content = search_result.artists
-        else:
-            content = search_result.playlists
-
-        if not content:
+        if not results:
             logging.info(f"[GENERAL] User {ctx.user.id} search for '{name}' returned no results")
             await self.respond(ctx, "error", "По запросу ничего не найдено.", delete_after=15, ephemeral=True)
             return
 
-        result = content.results[0]
-        await ctx.respond(embed=await generate_item_embed(result), view=ListenView(result))
+        result = results[0]
+        await ctx.respond(embed=await generate_item_embed(result), view=ListenView(result, requester_id=ctx.user.id))
 
         logging.info(f"[GENERAL] Successfully generated '{content_type}' message for user {ctx.author.id}")
@@ -0,0 +1,119 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Awaitable, Callable, Hashable
+
+from MusicBot.cogs.utils.cache import TTLCache
+from MusicBot.cogs.utils.metrics import metrics
+from MusicBot.cogs.utils.scheduler import Priority, ym_priority
+
+@dataclass
+class _AutocompleteState:
+    query: str | None = None
+    results: list[str] = field(default_factory=list)
+    exhaustive: bool = False
+    task: asyncio.Task | None = None
+    started_at: float = 0
+    overdue: asyncio.Task | None = None  # Fetch that exceeded the deadline and is left to finish
+    seq: int = 0  # Number of the last started fetch
+    stored_seq: int = 0  # Number of the fetch whose result is stored
+
+class AutocompleteEngine:
+    """Serve autocomplete suggestions per user and option.
+
+    - A newer value from the same user cancels the search that is still running for the previous one,
+      unless it already exceeded the deadline. One such search per key is left to finish so that
+      its result refreshes the fallback even if every search is slower than the deadline.
+    - If the last result was exhaustive (e.g. all user playlists), longer values are answered by filtering it.
+    - If the fetch doesn't finish before `deadline`, items of the last good result matching the value are returned instead.
+      The fetch keeps running and its result is used for the next keystrokes.
+    """
+
+    def __init__(self, deadline: float = 2.5, max_size: int = 1024, state_ttl: float = 120) -> None:
+        self.deadline = deadline
+        self._states: TTLCache[Hashable, _AutocompleteState] = TTLCache('autocomplete', max_size=max_size, ttl=state_ttl)
+
+    async def suggest(
+        self,
+        key: Hashable,
+        value: str,
+        fetch: Callable[[str], Awaitable[list[str] | None]],
+        *,
+        exhaustive: bool = False
+    ) -> list[str]:
+        """Return suggestions for `value`.
+
+        Args:
+            key (Hashable): Key of the user and option. Superseded requests are cancelled within the same key.
+            value (str): Current option value.
+            fetch (Callable[[str], Awaitable[list[str] | None]]): Fetch suggestions for the value. Returns None on failure.
+            exhaustive (bool, optional): Fetched results contain every item matching by substring. Defaults to False.
+
+        Returns:
+            list[str]: Suggestions.
+        """
+        query = _normalize(value)
+
+        if (state := self._states.get(key)) is None:
+            state = _AutocompleteState()
+        self._states.set(key, state)
+
+        if exhaustive and state.exhaustive and state.query is not None and query.startswith(state.query):
+            logging.debug(f"[AUTOCOMPLETE] Filtering cached result for '{state.query}' with '{query}'")
+            metrics.inc('autocomplete.prefix_hits')
+            return _filter(state.results, query)
+
+        if state.task and not state.task.done():
+            if monotonic() - state.started_at >= self.deadline and (not state.overdue or state.overdue.done()):
+                logging.debug("[AUTOCOMPLETE] Leaving overdue request to finish")
+                state.overdue = state.task
+            else:
+                logging.debug("[AUTOCOMPLETE] Cancelling superseded request")
+                metrics.inc('autocomplete.cancelled')
+                state.task.cancel()
+
+        state.seq += 1
+        with ym_priority(Priority.AUTOCOMPLETE):  # The task copies current context
+            task = asyncio.create_task(fetch(value))
+        task.add_done_callback(lambda t, seq=state.seq: _store_result(state, t, seq, query, exhaustive))
+        state.task = task
+        state.started_at = monotonic()
+
+        try:
+            if (results := await asyncio.wait_for(asyncio.shield(task), self.deadline)) is not None:
+                return results
+        except asyncio.TimeoutError:
+            logging.debug(f"[AUTOCOMPLETE] Deadline exceeded for '{query}'")
+            metrics.inc('autocomplete.deadline_exceeded')
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise  # The handler itself was cancelled
+        except Exception as e:
+            logging.warning(f"[AUTOCOMPLETE] Failed to fetch suggestions for '{query}': {e}")
+
+        return self._fallback(state, query)
+
+    def _fallback(self, state: _AutocompleteState, query: str) -> list[str]:
+        """Return items of the last good result that match `query`. Stale results never contradict the current query."""
+        metrics.inc('autocomplete.fallbacks')
+        return _filter(state.results, query)
+
+def _normalize(value: str) -> str:
+    return ' '.join(value.casefold().split())
+
+def _filter(results: list[str], query: str) -> list[str]:
+    return [item for item in results if query in _normalize(item)]
+
+def _store_result(state: _AutocompleteState, task: asyncio.Task, seq: int, query: str, exhaustive: bool) -> None:
+    if task.cancelled() or task.exception() or task.result() is None:
+        return
+
+    if seq < state.stored_seq:  # A newer result is already stored
+        return
+
+    state.stored_seq = seq
+
+    state.query = query
+    state.results = task.result()
+    state.exhaustive = exhaustive
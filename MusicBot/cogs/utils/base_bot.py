@@ -1,19 +1,56 @@
 import asyncio
 import logging
-from typing import Any, Literal, cast
+from os import getenv
+from typing import Any, AsyncIterator, Literal, cast
 
 import yandex_music.exceptions
-from yandex_music import ClientAsync as YMClient
+from yandex_music import ClientAsync as YMClient, Track, Album, Artist, Playlist, DownloadInfo
 
 import discord
 from discord import Interaction, ApplicationContext, RawReactionActionEvent, MISSING
 
-from MusicBot.database import VoiceGuildsDatabase, BaseUsersDatabase
+from MusicBot.database import VoiceGuildsDatabase, BaseUsersDatabase, ContentReference
+from MusicBot.cogs.utils.ym_client_pool import YMClientPool
+from MusicBot.cogs.utils.scheduler import RequestScheduler
+from MusicBot.cogs.utils.cache import TTLCache
+from MusicBot.cogs.utils.reactions import ReactionsCache
+from MusicBot.cogs.utils.playlists import PlaylistsCache
+from MusicBot.cogs.utils.single_flight import SingleFlight
+
+SEARCH_TYPES: dict[str, type[Track | Album | Artist | Playlist]] = {
+    'track': Track,
+    'album': Album,
+    'artist': Artist,
+    'playlist': Playlist
+}
 
 class BaseBot:
 
-    menu_views: dict[int, Any] = {}  # Store menu views and delete them when needed to prevent memory leaks for after callbacks.
-    _ym_clients: dict[str, YMClient] = {}  # Store YM clients to prevent creating new ones for each command.
+    menu_messages: dict[int, discord.Message | discord.PartialMessage] = {}  # Menu messages created by the bot, reused for edits.
+    _ym_clients = YMClientPool(  # Store YM clients to prevent creating new ones for each command.
+        validation_ttl=float(getenv('YM_CLIENT_VALIDATION_TTL', 600)),
+        max_size=int(getenv('YM_CLIENT_POOL_SIZE', 256)),
+        idle_timeout=float(getenv('YM_CLIENT_IDLE_TIMEOUT', 3600)),
+        scheduler=RequestScheduler(
+            rate=float(getenv('YM_RATE_LIMIT', 10)),
+            burst=int(getenv('YM_RATE_BURST', 20))
+        )
+    )
+    _search_cache: TTLCache[tuple[str, str], list[dict[str, Any]]] = TTLCache(  # Shared between users, results are not personalized.
+        'search_cache',
+        max_size=int(getenv('SEARCH_CACHE_SIZE', 1024)),
+        ttl=float(getenv('SEARCH_CACHE_TTL', 300))
+    )
+    _reactions = ReactionsCache()  # Liked and disliked track ids by YM user.
+    _playlists = PlaylistsCache()  # Playlists and their track ids by YM user.
+    _flights = SingleFlight('ym_requests')  # Coalesce identical non-personalized requests.
+    _download_infos: TTLCache[tuple[str, bool], list[DownloadInfo]] = TTLCache('download_infos', ttl=50)  # Signed links expire in about a minute.
+    _download_links: TTLCache[tuple[str, str, int, bool], str] = TTLCache('download_links', ttl=50)
+    _tracks: TTLCache[str, dict[str, Any]] = TTLCache(  # Track metadata by id, shared between users.
+        'tracks',
+        max_size=int(getenv('TRACKS_CACHE_SIZE', 4096)),
+        ttl=float(getenv('TRACKS_CACHE_TTL', 3600))
+    )
     
     def __init__(self, bot: discord.Bot | None) -> None:
         self.bot = bot
@@ -42,21 +79,158 @@ class BaseBot:
             return None
 
         try:
-            if token in self._ym_clients:
-                client = self._ym_clients[token]
-            
-                await client.account_status()
-                return client
-
-            client = await YMClient(token).init()
+            return await self._ym_clients.get(token)
         except yandex_music.exceptions.UnauthorizedError:
-            del self._ym_clients[token]
             await self.respond(ctx, "error", "Недействительный токен Yandex Music.", ephemeral=True, delete_after=15)
             return None
-
-        self._ym_clients[token] = client
-        return client
     
+    async def get_user_ym_client(self, uid: int) -> YMClient | None:
+        """Get Yandex Music client of the user without responding. Return None if the user has no valid token.
+
+        Args:
+            uid (int): Discord user id.
+
+        Returns:
+            (YMClient | None): Client or None.
+        """
+        if not (token := await self.users_db.get_ym_token(uid)):
+            logging.debug(f"[BASE_BOT] No token found for user {uid}")
+            return None
+
+        try:
+            return await self._ym_clients.get(token)
+        except yandex_music.exceptions.UnauthorizedError:
+            logging.debug(f"[BASE_BOT] Invalid token of user {uid}")
+            return None
+
+    @classmethod
+    async def search(
+        cls,
+        client: YMClient,
+        query: str,
+        content_type: Literal['track', 'album', 'artist', 'playlist']
+    ) -> list[Track | Album | Artist | Playlist] | None:
+        """Search content by query. Results are cached by normalized query and content type and shared between users.
+        Returned items are bound to `client`.
+
+        Args:
+            client (YMClient): Client of the user who searches.
+            query (str): Search query.
+            content_type (Literal['track', 'album', 'artist', 'playlist']): Content type.
+
+        Returns:
+            (list[Track | Album | Artist | Playlist] | None): Search results or None if search failed.
+        """
+        key = (' '.join(query.casefold().split()), content_type)
+
+        if (data := cls._search_cache.get(key)) is None:
+            logging.debug(f"[BASE_BOT] Searching '{query}' of type '{content_type}'")
+            if not (search := await client.search(query, nocorrect=True, type_=content_type)):
+                return None
+
+            result = getattr(search, f'{content_type}s')
+            data = [item.to_dict() for item in result.results] if result else []
+            cls._search_cache.set(key, data)
+
+        # Items hold a reference to the client that fetched them, so cached data is deserialized for each user.
+        return SEARCH_TYPES[content_type].de_list(data, client)  # type: ignore
+
+    @staticmethod
+    async def fetch_tracks(
+        client: YMClient,
+        track_ids: list[str | int],
+        *,
+        chunk_size: int = 100,
+        concurrency: int = 4
+    ) -> AsyncIterator[list[Track]]:
+        """Fetch tracks by ids with the multi-id endpoint. Chunks are requested concurrently and yielded in order.
+        Tracks that can't be fetched (e.g. user uploads) are skipped. Metadata of fetched tracks is cached and shared
+        between users, only missing tracks are requested.
+
+        Args:
+            client (YMClient): Client.
+            track_ids (list[str | int]): Track ids.
+            chunk_size (int, optional): Number of tracks per request. Defaults to 100.
+            concurrency (int, optional): Maximum number of simultaneous requests. Defaults to 4.
+
+        Yields:
+            list[Track]: Fetched tracks of the next chunk.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_chunk(chunk: list[str | int]) -> list[Track]:
+            keys = [str(track_id).split(':')[0] for track_id in chunk]  # Ids may include album id
+            found = {key: data for key in keys if (data := BaseBot._tracks.get(key)) is not None}
+
+            if (missing := [track_id for track_id, key in zip(chunk, keys) if key not in found]):
+                async with semaphore:
+                    try:
+                        # Concurrent lookups of the same tracks share one request.
+                        data = await BaseBot._flights.do(('tracks', tuple(missing)), lambda: _fetch_tracks_data(client, missing))
+                    except yandex_music.exceptions.YandexMusicError as e:
+                        logging.warning(f"[BASE_BOT] Failed to fetch {len(missing)} tracks: {e}")
+                        data = []
+
+                for item in data:
+                    found[str(item['id'])] = item
+                    BaseBot._tracks.set(str(item['id']), item)
+
+            # Tracks are deserialized for each caller so that they stay bound to the caller's client
+            return Track.de_list([found[key] for key in keys if key in found], client)  # type: ignore
+
+        tasks = [
+            asyncio.create_task(fetch_chunk(track_ids[i:i + chunk_size]))
+            for i in range(0, len(track_ids), chunk_size)
+        ]
+
+        try:
+            for task in tasks:
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    @classmethod
+    async def fetch_content_tracks(cls, client: YMClient, content: ContentReference) -> list[Track] | None:
+        """Fetch tracks of the referenced content. Return None if they can't be fetched.
+
+        Args:
+            client (YMClient): Client.
+            content (ContentReference): Content reference.
+
+        Returns:
+            (list[Track] | None): Tracks or None.
+        """
+        logging.debug(f"[BASE_BOT] Fetching tracks of '{content['type']}' {content['id']}")
+
+        try:
+            if content['type'] == 'track':
+                return [track async for chunk in cls.fetch_tracks(client, [content['id']]) for track in chunk] or None
+
+            elif content['type'] == 'album':
+                album = await client.albums_with_tracks(content['id'])
+                if not album or not album.volumes:
+                    return None
+                return [track for volume in album.volumes for track in volume]
+
+            elif content['type'] == 'artist':
+                artist_tracks = await client.artists_tracks(content['id'])
+                return artist_tracks.tracks.copy() if artist_tracks else None
+
+            elif content['type'] == 'playlist':
+                playlist = await client.users_playlists(content['id'], content['owner_uid'])
+                if not isinstance(playlist, Playlist) or not playlist.tracks:
+                    return None
+                if content['revision'] is not None and playlist.revision != content['revision']:
+                    logging.debug(f"[BASE_BOT] Playlist {content['id']} changed since it was referenced")
+                return [cast(Track, short_track.track) for short_track in playlist.tracks]
+
+            return [track async for chunk in cls.fetch_tracks(client, list(content['track_ids'])) for track in chunk] or None
+
+        except yandex_music.exceptions.YandexMusicError as e:
+            logging.warning(f"[BASE_BOT] Failed to fetch tracks of '{content['type']}' {content['id']}: {e}")
+            return None
+
     async def get_ym_token(self, ctx: ApplicationContext | Interaction | RawReactionActionEvent) -> str | None:
         """Get Yandex Music token from context. It's either individual or single."""
         
@@ -176,9 +350,24 @@ class BaseBot:
 
         return ctx.user_id if isinstance(ctx, discord.RawReactionActionEvent) else ctx.user.id if ctx.user else None
     
-    async def init_menu_view(self, ctx: ApplicationContext | Interaction | RawReactionActionEvent, gid: int, *, disable: bool = False) -> None:
+    @staticmethod
+    def forget_menu_message(gid: int, message_id: int | None = None) -> None:
+        """Remove cached menu message of the guild. If `message_id` is set, only remove it if it matches.
+
+        Args:
+            gid (int): Guild id.
+            message_id (int | None, optional): Id of the deleted message. Defaults to None.
+        """
+        if (message := BaseBot.menu_messages.get(gid)) and (message_id is None or message.id == message_id):
+            logging.debug(f"[BASE_BOT] Forgetting menu message {message.id} in guild {gid}")
+            del BaseBot.menu_messages[gid]
+
+    async def build_menu_view(self, ctx: ApplicationContext | Interaction | RawReactionActionEvent, *, disable: bool = False) -> Any:
+        """Render menu view for the current state of the guild. Clicks are handled by the persistent view
+        registered at startup, so the returned view is only used to send components.
+        """
         from MusicBot.ui import MenuView
-        self.menu_views[gid] = await MenuView(ctx).init(disable=disable)
+        return await MenuView(ctx).init(disable=disable)
     
     def generate_response_embed(
         self,
@@ -241,3 +430,6 @@ class BaseBot:
             return self.bot.loop
         else:
             raise TypeError(f"Invalid context type: '{type(ctx).__name__}'.")
+
+async def _fetch_tracks_data(client: YMClient, track_ids: list[str | int]) -> list[dict[str, Any]]:
+    return [track.to_dict() for track in await client.tracks(track_ids)]
@@ -0,0 +1,65 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Generic, Hashable, TypeVar
+
+from MusicBot.cogs.utils.metrics import metrics
+
+K = TypeVar('K', bound=Hashable)
+V = TypeVar('V')
+
+class TTLCache(Generic[K, V]):
+    """LRU cache with per-entry time to live. Hits, misses and size are reported to metrics under `name`."""
+
+    def __init__(self, name: str, max_size: int = 1024, ttl: float = 300) -> None:
+        self.name = name
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+
+    def get(self, key: K) -> V | None:
+        """Return value for `key` or None if it's missing or expired."""
+        entry = self._data.get(key)
+
+        if entry is None or entry[0] <= monotonic():
+            if entry is not None:
+                del self._data[key]
+            metrics.inc(f'{self.name}.misses')
+            return None
+
+        metrics.inc(f'{self.name}.hits')
+        self._data.move_to_end(key)
+        return entry[1]
+
+    def set(self, key: K, value: V, ttl: float | None = None) -> None:
+        """Store `value` for `key`. Evict least recently used entries if the cache is full.
+
+        Args:
+            key (K): Key.
+            value (V): Value.
+            ttl (float | None, optional): Time to live in seconds. Uses cache ttl if not provided. Defaults to None.
+        """
+        self._data[key] = (monotonic() + (self.ttl if ttl is None else ttl), value)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+            metrics.inc(f'{self.name}.evicted')
+
+        metrics.set_gauge(f'{self.name}.size', len(self._data))
+
+    def pop(self, key: K) -> V | None:
+        """Remove `key` and return its value if present."""
+        entry = self._data.pop(key, None)
+        metrics.set_gauge(f'{self.name}.size', len(self._data))
+        return entry[1] if entry else None
+
+    def clear(self) -> None:
+        self._data.clear()
+        metrics.set_gauge(f'{self.name}.size', 0)
+
+    def __contains__(self, key: K) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry[0] > monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -10,10 +10,14 @@ from PIL import Image
 from yandex_music import Track, Album, Artist, Playlist, Label
 from discord import Embed
 
+from MusicBot.cogs.utils.single_flight import SingleFlight
+
 explicit_eid: Final[str | None] = getenv('EXPLICIT_EID')
 if not explicit_eid:
     raise ValueError('You must specify explicit emoji id in your enviroment (EXPLICIT_EID).')
 
+_cover_flights = SingleFlight('cover_fetches')
+
 async def generate_item_embed(item: Track | Album | Artist | Playlist | list[Track], vibing: bool = False) -> Embed:
     """Generate item embed. list[Track] is used for likes. If vibing is True, add vibing image.
 
@@ -266,12 +270,40 @@ async def _get_average_color_from_url(url: str) -> int:
         int: RGB Hex code. 0x000 if failed.
     """
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                response.raise_for_status()
-                result = await response.read()
+        image = await _cover_flights.do(url, lambda: _fetch_image(url))
+    except aiohttp.ClientError:
+        return 0x000
+
+    return _get_average_color(image)
+
+async def _fetch_image(url: str) -> bytes:
+    """Download image from url.
+
+    Args:
+        url (str): Image url.
+
+    Returns:
+        bytes: Image content.
 
-        img_file = Image.open(BytesIO(result))
+    Raises:
+        aiohttp.ClientError: Failed to fetch image.
+    """
+    async with aiohttp.ClientSession() as session:
+        async with session.get(url) as response:
+            response.raise_for_status()
+            return await response.read()
+
+def _get_average_color(image: bytes) -> int:
+    """Calculate average color of the image.
+
+    Args:
+        image (bytes): Image content.
+
+    Returns:
+        int: RGB Hex code. 0x000 if failed.
+    """
+    try:
+        img_file = Image.open(BytesIO(image))
         img = img_file.convert('RGB')
         width, height = img.size
         r_total, g_total, b_total = 0, 0, 0
@@ -289,7 +321,7 @@ async def _get_average_color_from_url(url: str) -> int:
         b = b_total // count
 
         return (r << 16) + (g << 8) + b
-    except (aiohttp.ClientError, IOError, ValueError):
+    except (IOError, ValueError):
         return 0x000
 
 def _format_duration(duration_ms: int) -> str:
@@ -0,0 +1,64 @@
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable
+
+from yandex_music.exceptions import NetworkError, BadRequestError
+
+from MusicBot.cogs.utils.metrics import metrics
+
+class FeedbackQueue:
+    """Background delivery of vibe feedback.
+
+    Events are sent one by one per key (guild) in the order they were queued, so the station always sees
+    `trackStarted` before `trackFinished` of the same track. Network errors are retried with exponential backoff.
+    """
+
+    def __init__(self, retries: int = 3, backoff: float = 1) -> None:
+        self.retries = retries
+        self.backoff = backoff
+        self._queues: dict[Hashable, deque[Callable[[], Awaitable[Any]]]] = {}
+        self._workers: dict[Hashable, asyncio.Task] = {}
+
+    def put(self, key: Hashable, send: Callable[[], Awaitable[Any]]) -> None:
+        """Queue `send` for delivery after all events queued earlier with the same key.
+
+        Args:
+            key (Hashable): Queue key.
+            send (Callable[[], Awaitable[Any]]): Coroutine function that sends the event.
+        """
+        self._queues.setdefault(key, deque()).append(send)
+        metrics.inc('feedback.queued')
+
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._work(key))
+
+    async def _work(self, key: Hashable) -> None:
+        queue = self._queues[key]
+        try:
+            while queue:
+                await self._deliver(queue.popleft())
+        finally:
+            del self._workers[key]
+            if not queue:
+                del self._queues[key]
+
+    async def _deliver(self, send: Callable[[], Awaitable[Any]]) -> None:
+        for attempt in range(self.retries):
+            try:
+                await send()
+                metrics.inc('feedback.sent')
+                return
+            except BadRequestError as e:
+                logging.warning(f"[FEEDBACK] Feedback rejected: {e}")
+                break
+            except NetworkError as e:
+                logging.info(f"[FEEDBACK] Failed to send feedback (attempt {attempt + 1}/{self.retries}): {e}")
+                if attempt < self.retries - 1:
+                    metrics.inc('feedback.retries')
+                    await asyncio.sleep(self.backoff * 2 ** attempt)
+            except Exception as e:
+                logging.error(f"[FEEDBACK] Unexpected error while sending feedback: {e}")
+                break
+
+        metrics.inc('feedback.dropped')
@@ -0,0 +1,163 @@
+import asyncio
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import discord
+
+from MusicBot.cogs.utils.metrics import metrics
+
+@dataclass
+class _PendingEdit:
+    message: discord.Message | discord.PartialMessage
+    fields: dict[str, Any] = field(default_factory=dict)
+    future: asyncio.Future[bool] = field(default_factory=lambda: asyncio.get_running_loop().create_future())
+
+@dataclass
+class _GuildEdits:
+    pending: _PendingEdit | None = None
+    worker: asyncio.Task | None = None
+
+class MenuEditScheduler:
+    """Coalesce edits of the menu message by guild.
+
+    A lone edit is sent right away. Edits scheduled while an edit is being sent or within `window` seconds
+    after it are merged into one: later embed and view replace earlier ones, so intermediate states are
+    never sent. Rate limits are handled by the HTTP client of py-cord, which waits and retries on 429.
+    If the message was deleted, `on_not_found` is called with guild id and message id.
+
+    A fingerprint of the last state sent to each message is kept. Fields that didn't change are not sent
+    and edits without changes are skipped. Edits made elsewhere (e.g. through interactions) must be
+    reported with `rendered` to keep the fingerprint correct.
+    """
+
+    def __init__(
+        self,
+        window: float = 0.5,
+        *,
+        on_not_found: Callable[[int, int], None] | None = None
+    ) -> None:
+        self.window = window
+        self.on_not_found = on_not_found
+        self._guilds: dict[int, _GuildEdits] = {}
+        self._rendered: dict[int, tuple[int, dict[str, str]]] = {}  # Guild id -> message id and field fingerprints
+
+    def schedule(self, guild_id: int, message: discord.Message | discord.PartialMessage, **fields: Any) -> asyncio.Future[bool]:
+        """Schedule an edit of the menu message.
+
+        Args:
+            guild_id (int): Guild id.
+            message (discord.Message | discord.PartialMessage): Menu message.
+            **fields (Any): Arguments of `Message.edit`, e.g. `embed` and `view`.
+
+        Returns:
+            asyncio.Future[bool]: Resolves to True when the merged edit is sent, False if it failed.
+        """
+        guild = self._guilds.setdefault(guild_id, _GuildEdits())
+
+        if guild.pending and guild.pending.message.id != message.id:
+            # The menu was replaced, edits of the old message are pointless
+            logging.debug(f"[MENU_EDITS] Dropping edits of old menu message {guild.pending.message.id}")
+            guild.pending.future.set_result(False)
+            guild.pending = None
+
+        if guild.pending:
+            metrics.inc('menu_edits.coalesced')
+        else:
+            guild.pending = _PendingEdit(message)
+
+        guild.pending.message = message
+        guild.pending.fields.update(fields)
+
+        if not guild.worker or guild.worker.done():
+            guild.worker = asyncio.create_task(self._work(guild_id, guild))
+
+        return guild.pending.future
+
+    def cancel(self, guild_id: int) -> None:
+        """Drop the pending edit of the guild, e.g. when the menu message was deleted."""
+        self._rendered.pop(guild_id, None)
+        if (guild := self._guilds.get(guild_id)) and guild.pending:
+            guild.pending.future.set_result(False)
+            guild.pending = None
+
+    def rendered(self, guild_id: int, message_id: int, **fields: Any) -> None:
+        """Remember the state of the menu message after it was edited without the scheduler.
+        Pending edits of these fields are dropped as they were built from older state.
+
+        Args:
+            guild_id (int): Guild id.
+            message_id (int): Menu message id.
+            **fields (Any): Arguments the message was edited with.
+        """
+        self._remember(guild_id, message_id, {key: _fingerprint(value) for key, value in fields.items()})
+
+        if (guild := self._guilds.get(guild_id)) and guild.pending and guild.pending.message.id == message_id:
+            for key in fields:
+                guild.pending.fields.pop(key, None)
+
+            if not guild.pending.fields:
+                logging.debug(f"[MENU_EDITS] Pending edit of menu message {message_id} was superseded")
+                guild.pending.future.set_result(True)
+                guild.pending = None
+
+    async def _work(self, guild_id: int, guild: _GuildEdits) -> None:
+        try:
+            while (edit := guild.pending):
+                guild.pending = None
+
+                result = await self._send(guild_id, edit)
+                if not edit.future.done():
+                    edit.future.set_result(result)
+
+                # Edits scheduled during the window are merged and sent after it
+                await asyncio.sleep(self.window)
+        finally:
+            if not guild.pending:
+                self._guilds.pop(guild_id, None)
+
+    async def _send(self, guild_id: int, edit: _PendingEdit) -> bool:
+        """Send the edit. Return True on success."""
+        # Fingerprints are taken right before sending because views are changed in place
+        fingerprints = {key: _fingerprint(value) for key, value in edit.fields.items()}
+        fields = self._changed(guild_id, edit.message.id, edit.fields, fingerprints)
+        if not fields:
+            logging.debug(f"[MENU_EDITS] Menu message {edit.message.id} is up to date, skipping edit")
+            metrics.inc('menu_edits.skipped')
+            return True
+
+        try:
+            await edit.message.edit(**fields)
+            metrics.inc('menu_edits.sent')
+            self._remember(guild_id, edit.message.id, fingerprints)
+            return True
+        except discord.NotFound:
+            logging.info(f"[MENU_EDITS] Menu message {edit.message.id} not found")
+            self._rendered.pop(guild_id, None)
+            if self.on_not_found:
+                self.on_not_found(guild_id, edit.message.id)
+            return False
+        except discord.DiscordException as e:
+            logging.warning(f"[MENU_EDITS] Error while editing menu message: {e}")
+
+        self._rendered.pop(guild_id, None)  # State of the message is unknown now
+        metrics.inc('menu_edits.failed')
+        return False
+
+    def _changed(self, guild_id: int, message_id: int, fields: dict[str, Any], fingerprints: dict[str, str]) -> dict[str, Any]:
+        rendered_id, rendered = self._rendered.get(guild_id, (None, {}))
+        if rendered_id != message_id:
+            return fields
+        return {key: value for key, value in fields.items() if rendered.get(key) != fingerprints[key]}
+
+    def _remember(self, guild_id: int, message_id: int, fingerprints: dict[str, str]) -> None:
+        rendered_id, rendered = self._rendered.get(guild_id, (None, {}))
+        self._rendered[guild_id] = (message_id, (rendered if rendered_id == message_id else {}) | fingerprints)
+
+def _fingerprint(value: Any) -> str:
+    if isinstance(value, discord.Embed):
+        value = value.to_dict()
+    elif isinstance(value, discord.ui.View):
+        value = value.to_components()
+    return json.dumps(value, sort_keys=True, default=str)
@@ -0,0 +1,22 @@
+from collections import Counter
+
+class Metrics:
+    """Process-wide counters and gauges. Used to track caches and pools."""
+
+    def __init__(self) -> None:
+        self.counters: Counter[str] = Counter()
+        self.gauges: dict[str, float] = {}
+
+    def inc(self, name: str, value: int = 1) -> None:
+        """Increment counter `name` by `value`."""
+        self.counters[name] += value
+
+    def set_gauge(self, name: str, value: float) -> None:
+        """Set gauge `name` to `value`."""
+        self.gauges[name] = value
+
+    def snapshot(self) -> dict[str, float]:
+        """Return current values of all counters and gauges."""
+        return {**self.counters, **self.gauges}
+
+metrics = Metrics()
@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from time import monotonic
+
+from yandex_music import ClientAsync as YMClient, Playlist
+
+from MusicBot.cogs.utils.cache import TTLCache
+from MusicBot.cogs.utils.metrics import metrics
+
+@dataclass
+class CachedPlaylist:
+    kind: int
+    uid: int
+    title: str | None
+    revision: int
+    track_ids: list[str] | None = None  # None if tracks were not fetched for the current revision
+    track_set: set[str] = field(default_factory=set)
+
+    def __contains__(self, track_id: str | int) -> bool:
+        return str(track_id) in self.track_set
+
+    def set_tracks(self, track_ids: list[str]) -> None:
+        self.track_ids = track_ids
+        self.track_set = set(track_ids)
+
+@dataclass
+class _UserPlaylists:
+    playlists: dict[int, CachedPlaylist] = field(default_factory=dict)
+    checked_at: float = float('-inf')
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+class PlaylistsCache:
+    """User playlists with their revisions and track ids by Yandex Music user.
+
+    The list of playlists is refetched at most once per `refresh_interval` seconds. Tracks of a playlist are
+    fetched on demand and only refetched when its revision changed. Insertions and deletions made through
+    the bot are applied locally with the revision returned by the API.
+    """
+
+    def __init__(self, refresh_interval: float = 60, max_size: int = 1024, ttl: float = 3600) -> None:
+        self.refresh_interval = refresh_interval
+        self._users: TTLCache[int, _UserPlaylists] = TTLCache('playlists', max_size=max_size, ttl=ttl)
+
+    async def get_all(self, client: YMClient) -> list[CachedPlaylist] | None:
+        """Return playlists of the client's user. Refresh the list if needed.
+
+        Args:
+            client (YMClient): Client of the user.
+
+        Returns:
+            (list[CachedPlaylist] | None): Playlists or None if they can't be fetched.
+        """
+        if not (user := self._get_user(client)):
+            return None
+
+        async with user.lock:
+            if monotonic() - user.checked_at >= self.refresh_interval:
+                logging.debug("[PLAYLISTS] Refreshing playlists list")
+                metrics.inc('playlists.list_refreshes')
+
+                playlists: dict[int, CachedPlaylist] = {}
+                for playlist in await client.users_playlists_list():
+                    if playlist.kind is None or playlist.uid is None:
+                        continue
+
+                    cached = user.playlists.get(playlist.kind)
+                    if cached and cached.revision == playlist.revision:
+                        cached.title = playlist.title
+                        playlists[playlist.kind] = cached
+                    else:
+                        playlists[playlist.kind] = CachedPlaylist(playlist.kind, playlist.uid, playlist.title, playlist.revision or 0)
+
+                user.playlists = playlists
+                user.checked_at = monotonic()
+
+            return list(user.playlists.values())
+
+    async def get(self, client: YMClient, kind: int) -> CachedPlaylist | None:
+        """Return playlist of the client's user with fetched track ids.
+
+        Args:
+            client (YMClient): Client of the user.
+            kind (int): Playlist kind.
+
+        Returns:
+            (CachedPlaylist | None): Playlist or None if not found.
+        """
+        if await self.get_all(client) is None or not (user := self._get_user(client)):
+            return None
+
+        if not (cached := user.playlists.get(kind)):
+            return None
+
+        if cached.track_ids is None:
+            logging.debug(f"[PLAYLISTS] Fetching tracks of playlist {kind} revision {cached.revision}")
+            metrics.inc('playlists.track_fetches')
+
+            if not (playlist := await client.users_playlists(kind=kind, user_id=cached.uid)):
+                return None
+
+            self._update_from(cached, playlist)
+
+        return cached
+
+    def apply(self, client: YMClient, kind: int, playlist: Playlist, *, inserted: str | None = None, removed_at: int | None = None) -> None:
+        """Apply track insertion or deletion made by the client's user.
+
+        Args:
+            client (YMClient): Client of the user.
+            kind (int): Playlist kind.
+            playlist (Playlist): Playlist returned by the API after modification.
+            inserted (str | None, optional): Id of the track inserted at the beginning. Defaults to None.
+            removed_at (int | None, optional): Index of the deleted track. Defaults to None.
+        """
+        if not (user := self._get_user(client)) or not (cached := user.playlists.get(kind)) or cached.track_ids is None:
+            return
+
+        track_ids = cached.track_ids.copy()
+        if inserted is not None:
+            track_ids.insert(0, inserted)
+        if removed_at is not None:
+            del track_ids[removed_at]
+
+        if playlist.track_count is not None and playlist.track_count != len(track_ids):
+            logging.debug(f"[PLAYLISTS] Playlist {kind} was modified elsewhere")
+            cached.track_ids = None
+        else:
+            cached.set_tracks(track_ids)
+
+        cached.revision = playlist.revision or 0
+
+    def invalidate(self, client: YMClient, kind: int) -> None:
+        """Drop cached tracks of the playlist so they are refetched with the current revision on the next `get`.
+
+        Args:
+            client (YMClient): Client of the user.
+            kind (int): Playlist kind.
+        """
+        if (user := self._get_user(client)) and (cached := user.playlists.get(kind)):
+            logging.debug(f"[PLAYLISTS] Invalidating playlist {kind}")
+            metrics.inc('playlists.invalidations')
+            cached.track_ids = None
+            cached.track_set = set()
+
+    def _update_from(self, cached: CachedPlaylist, playlist: Playlist) -> None:
+        cached.title = playlist.title
+        cached.revision = playlist.revision or 0
+        cached.set_tracks([str(track.id) for track in playlist.tracks])
+
+    def _get_user(self, client: YMClient) -> _UserPlaylists | None:
+        if not client.me or not client.me.account or not client.me.account.uid:
+            return None
+
+        if (user := self._users.get(client.me.account.uid)) is None:
+            user = _UserPlaylists()
+        self._users.set(client.me.account.uid, user)
+        return user
@@ -0,0 +1,88 @@
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from time import monotonic
+from typing import Literal
+
+from yandex_music import ClientAsync as YMClient
+
+from MusicBot.cogs.utils.cache import TTLCache
+from MusicBot.cogs.utils.metrics import metrics
+
+@dataclass
+class _Library:
+    revision: int = 0
+    ids: set[str] = field(default_factory=set)
+    checked_at: float = float('-inf')
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+class ReactionsCache:
+    """Sets of liked and disliked track ids by Yandex Music user.
+
+    Libraries are rechecked at most once per `refresh_interval` seconds with `if_modified_since_revision`,
+    so the track list is only downloaded when the revision changed. Likes and dislikes made through the bot
+    are applied locally.
+    """
+
+    def __init__(self, refresh_interval: float = 60, max_size: int = 1024, ttl: float = 3600) -> None:
+        self.refresh_interval = refresh_interval
+        self._libraries: TTLCache[tuple[int, str], _Library] = TTLCache('reactions', max_size=max_size, ttl=ttl)
+
+    async def get(self, client: YMClient, kind: Literal['like', 'dislike']) -> set[str] | None:
+        """Return ids of liked or disliked tracks of the client's user. Refresh them if needed.
+
+        Args:
+            client (YMClient): Client of the user.
+            kind (Literal['like', 'dislike']): Library type.
+
+        Returns:
+            (set[str] | None): Track ids or None if library can't be fetched.
+        """
+        if not client.me or not client.me.account or not client.me.account.uid:
+            return None
+
+        key = (client.me.account.uid, kind)
+        if (library := self._libraries.get(key)) is None:
+            library = _Library()
+        self._libraries.set(key, library)
+
+        async with library.lock:
+            if monotonic() - library.checked_at < self.refresh_interval:
+                return library.ids
+
+            logging.debug(f"[REACTIONS] Checking {kind}s revision {library.revision}")
+            metrics.inc('reactions.revision_checks')
+
+            if kind == 'like':
+                collection = await client.users_likes_tracks(if_modified_since_revision=library.revision)
+            else:
+                collection = await client.users_dislikes_tracks(if_modified_since_revision=library.revision)
+
+            if collection is None:
+                return None if library.checked_at == float('-inf') else library.ids
+
+            if collection.revision != library.revision or not library.revision:
+                logging.debug(f"[REACTIONS] {kind.capitalize()}s changed to revision {collection.revision}")
+                metrics.inc('reactions.downloads')
+                library.ids = {str(track.id) for track in collection.tracks}
+                library.revision = collection.revision or 0
+
+            library.checked_at = monotonic()
+            return library.ids
+
+    def update(self, client: YMClient, kind: Literal['like', 'dislike'], track_id: str | int, added: bool) -> None:
+        """Apply a like or dislike made by the client's user to the cached library."""
+        if not client.me or not client.me.account or not client.me.account.uid:
+            return
+
+        uid = client.me.account.uid
+        if (library := self._libraries.get((uid, kind))):
+            if added:
+                library.ids.add(str(track_id))
+            else:
+                library.ids.discard(str(track_id))
+
+        # Liking a track removes its dislike and vice versa
+        opposite = 'dislike' if kind == 'like' else 'like'
+        if added and (library := self._libraries.get((uid, opposite))):
+            library.ids.discard(str(track_id))
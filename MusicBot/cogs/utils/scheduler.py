@@ -0,0 +1,117 @@
+import asyncio
+import heapq
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from itertools import count
+from time import monotonic
+from typing import Iterator
+
+from yandex_music.exceptions import YandexMusicError
+
+from MusicBot.cogs.utils.metrics import metrics
+
+class Priority(IntEnum):
+    """Priority classes of Yandex Music requests. Lower value is served first."""
+    PLAYBACK = 0
+    FEEDBACK = 1
+    EMBEDS = 2
+    AUTOCOMPLETE = 3
+
+request_priority: ContextVar[Priority] = ContextVar('request_priority', default=Priority.EMBEDS)
+
+@contextmanager
+def ym_priority(priority: Priority) -> Iterator[None]:
+    """Set priority of Yandex Music requests made in this context."""
+    token = request_priority.set(priority)
+    try:
+        yield
+    finally:
+        request_priority.reset(token)
+
+class RequestShedError(YandexMusicError):
+    """Request was dropped because the token is rate limited and the request has low priority."""
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated_at: float = field(default_factory=monotonic)
+    waiting: list[tuple[int, int, asyncio.Future]] = field(default_factory=list)
+    dispatcher: asyncio.Task | None = None
+
+class RequestScheduler:
+    """Token bucket rate limiter for Yandex Music requests by token.
+
+    Requests that exceed the rate wait in a queue ordered by `Priority`. Requests with priority `shed_from`
+    or lower are rejected with `RequestShedError` if they would wait longer than `max_wait` seconds.
+    """
+
+    def __init__(self, rate: float = 10, burst: int = 20, max_wait: float = 2, shed_from: Priority = Priority.AUTOCOMPLETE) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_wait = max_wait
+        self.shed_from = shed_from
+        self._buckets: dict[str, _Bucket] = {}
+        self._seq = count()
+
+    async def acquire(self, token: str) -> None:
+        """Wait until a request can be made with `token`. Priority is taken from `request_priority`.
+
+        Raises:
+            RequestShedError: Request has low priority and the token is overloaded.
+        """
+        priority = request_priority.get()
+        bucket = self._get_bucket(token)
+        self._refill(bucket)
+
+        if not bucket.waiting and bucket.tokens >= 1:
+            bucket.tokens -= 1
+            return
+
+        if priority >= self.shed_from and (len(bucket.waiting) + 1 - bucket.tokens) / self.rate > self.max_wait:
+            logging.debug(f"[SCHEDULER] Shedding request with priority {priority.name}")
+            metrics.inc('scheduler.shed')
+            raise RequestShedError("Too many requests for this token.")
+
+        metrics.inc(f'scheduler.queued.{priority.name.lower()}')
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(bucket.waiting, (priority, next(self._seq), future))
+
+        if not bucket.dispatcher or bucket.dispatcher.done():
+            bucket.dispatcher = asyncio.create_task(self._dispatch(bucket))
+
+        await future
+
+    async def _dispatch(self, bucket: _Bucket) -> None:
+        """Release queued requests in priority order as tokens become available."""
+        while bucket.waiting:
+            self._refill(bucket)
+
+            if bucket.tokens < 1:
+                await asyncio.sleep((1 - bucket.tokens) / self.rate)
+                continue
+
+            _, _, future = heapq.heappop(bucket.waiting)
+            if not future.done():  # Cancelled waiters don't use tokens
+                bucket.tokens -= 1
+                future.set_result(None)
+
+    def _get_bucket(self, token: str) -> _Bucket:
+        if not (bucket := self._buckets.get(token)):
+            if len(self._buckets) >= 1024:
+                self._drop_idle_buckets()
+            bucket = self._buckets[token] = _Bucket(self.burst)
+        return bucket
+
+    def _drop_idle_buckets(self) -> None:
+        for token, bucket in list(self._buckets.items()):
+            self._refill(bucket)
+            if not bucket.waiting and bucket.tokens >= self.burst:
+                del self._buckets[token]
+
+    def _refill(self, bucket: _Bucket) -> None:
+        now = monotonic()
+        bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated_at) * self.rate)
+        bucket.updated_at = now
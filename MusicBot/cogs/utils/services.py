@@ -0,0 +1,20 @@
+from MusicBot.cogs.utils.base_bot import BaseBot
+from MusicBot.cogs.utils.cache import TTLCache
+from MusicBot.cogs.utils.voice_extension import VoiceExtension
+
+class Services:
+    """Application-scoped objects shared by UI components. Components use them instead of inheriting
+    `VoiceExtension` and constructing their own databases.
+    """
+
+    def __init__(self) -> None:
+        self.voice = VoiceExtension(None)  # Playback controller. Bot instance is not set, so it needs interaction contexts.
+        self.db = self.voice.db
+        self.users_db = self.voice.users_db
+        self.ym_clients = BaseBot._ym_clients
+        self.reactions = BaseBot._reactions
+        self.playlists = BaseBot._playlists
+        self.flights = BaseBot._flights
+        self.lyrics: TTLCache[str, list[str]] = TTLCache('lyrics', max_size=256, ttl=3600)  # Lyrics pages by track id. Empty if not found.
+
+services = Services()
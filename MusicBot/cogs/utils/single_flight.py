@@ -0,0 +1,42 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Hashable, TypeVar
+
+from MusicBot.cogs.utils.metrics import metrics
+
+T = TypeVar('T')
+
+class SingleFlight:
+    """Coalesce identical concurrent calls. While a call for a key is in flight, other callers with the same key
+    wait for its result instead of making their own. Only use it for calls whose result doesn't depend on the caller.
+    """
+
+    def __init__(self, name: str = 'single_flight') -> None:
+        self.name = name
+        self._calls: dict[Hashable, asyncio.Task[Any]] = {}
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[T]]) -> T:
+        """Run `func` or join the call already running for `key`.
+
+        Args:
+            key (Hashable): Call key. Must include everything the result depends on.
+            func (Callable[[], Awaitable[T]]): Call to make.
+
+        Returns:
+            T: Result of the call. Exceptions are propagated to every caller.
+        """
+        if (task := self._calls.get(key)):
+            logging.debug(f"[SINGLE_FLIGHT] Joining in-flight call for {key}")
+            metrics.inc(f'{self.name}.coalesced')
+        else:
+            metrics.inc(f'{self.name}.calls')
+            task = self._calls[key] = asyncio.ensure_future(func())
+            task.add_done_callback(lambda t: self._done(key, t))
+
+        # Cancelling one caller must not cancel the call for the others
+        return await asyncio.shield(task)
+
+    def _done(self, key: Hashable, task: asyncio.Task[Any]) -> None:
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # Mark as retrieved in case every caller was cancelled
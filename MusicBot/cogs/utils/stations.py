@@ -0,0 +1,101 @@
+import asyncio
+import logging
+from bisect import bisect_left
+from dataclasses import dataclass
+from difflib import get_close_matches
+from time import monotonic
+
+from yandex_music import ClientAsync as YMClient
+
+from MusicBot.cogs.utils.metrics import metrics
+
+@dataclass(frozen=True, slots=True)
+class Station:
+    name: str
+    type: str
+    id: str
+
+class StationCatalogue:
+    """Cached list of rotor stations indexed for case-insensitive lookup.
+
+    Every word of a station name is indexed, so "рок" finds "Русский рок". The list is the same for all users
+    and is refreshed with the client of whoever needs it after `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float = 3600) -> None:
+        self.ttl = ttl
+        self._stations: dict[str, Station] = {}  # Casefolded name -> station
+        self._index: list[tuple[str, str]] = []  # Sorted (casefolded name suffix starting at a word, casefolded name)
+        self._keys: list[str] = []
+        self._updated_at = float('-inf')
+        self._lock = asyncio.Lock()
+
+    @property
+    def expired(self) -> bool:
+        return monotonic() - self._updated_at >= self.ttl
+
+    async def refresh(self, client: YMClient, *, force: bool = False) -> None:
+        """Fetch stations and rebuild the index if it expired.
+
+        Args:
+            client (YMClient): Client used to fetch stations.
+            force (bool, optional): Refresh even if not expired. Defaults to False.
+        """
+        async with self._lock:
+            if not force and not self.expired:
+                return
+
+            logging.debug("[STATIONS] Refreshing station catalogue")
+            metrics.inc('stations.refreshes')
+
+            stations: dict[str, Station] = {}
+            for content in await client.rotor_stations_list():
+                if not content.station or not content.station.name or not content.ad_params:
+                    continue
+
+                vibe_type, _, vibe_id = content.ad_params.other_params.partition(':')
+                if vibe_type and vibe_id:
+                    stations.setdefault(content.station.name.casefold(), Station(content.station.name, vibe_type, vibe_id))
+
+            index = []
+            for key in stations:
+                words = key.split(' ')
+                index.extend((' '.join(words[i:]), key) for i in range(len(words)))
+            index.sort()
+
+            self._stations = stations
+            self._index = index
+            self._keys = [suffix for suffix, _ in index]
+            self._updated_at = monotonic()
+
+    def resolve(self, name: str) -> Station | None:
+        """Return station by its exact name, case-insensitive."""
+        return self._stations.get(name.casefold())
+
+    def suggest(self, query: str, limit: int = 25) -> list[str]:
+        """Return names of stations with a word starting with `query`. Fall back to fuzzy matching if nothing found.
+
+        Args:
+            query (str): Search query.
+            limit (int, optional): Maximum number of results. Defaults to 25.
+
+        Returns:
+            list[str]: Station names.
+        """
+        query = ' '.join(query.casefold().split())
+        found: dict[str, None] = {}  # Ordered set
+
+        for i in range(bisect_left(self._keys, query), len(self._keys)):
+            suffix, key = self._index[i]
+            if not suffix.startswith(query) or len(found) >= limit:
+                break
+            found[key] = None
+
+        if not found:
+            metrics.inc('stations.fuzzy_lookups')
+            found = dict.fromkeys(get_close_matches(query, self._stations, n=limit, cutoff=0.6))
+
+        return [self._stations[key].name for key in found]
+
+    def __len__(self) -> int:
+        return len(self._stations)
@@ -3,20 +3,30 @@ import aiofiles
 import logging
 import io
 
-from typing import Any, Literal, cast
+from os import getenv
+from typing import Any, Final, Literal, cast
 
 import yandex_music.exceptions
-from yandex_music import Track, TrackShort
+from yandex_music import Track, ClientAsync as YMClient
 
 import discord
 from discord import Interaction, ApplicationContext, RawReactionActionEvent
 
 from MusicBot.cogs.utils.base_bot import BaseBot
+from MusicBot.cogs.utils.scheduler import Priority, ym_priority
+from MusicBot.cogs.utils.feedback import FeedbackQueue
+from MusicBot.cogs.utils.menu_edits import MenuEditScheduler
 from MusicBot.cogs.utils import generate_item_embed
-from MusicBot.database import ExplicitGuild, MessageVotes
+from MusicBot.database import ExplicitGuild, MessageVotes, ContentReference
+
+VIBE_PREFETCH_THRESHOLD: Final[int] = int(getenv('VIBE_PREFETCH_THRESHOLD', 2))
 
 class VoiceExtension(BaseBot):
 
+    _vibe_prefetches: dict[int, asyncio.Task] = {}  # Guilds for which next vibe batch is being fetched.
+    _feedback_queue = FeedbackQueue()  # Vibe feedback is sent in background to not delay playback.
+    _menu_edits = MenuEditScheduler(on_not_found=BaseBot.forget_menu_message)  # Edits of menu messages are merged to stay within Discord rate limits.
+
     def __init__(self, bot: discord.Bot | None) -> None:
         super().__init__(bot)
 
@@ -66,35 +76,43 @@ class VoiceExtension(BaseBot):
             logging.info(f"[VC_EXT] Deleting old menu message {guild['current_menu']} in guild {ctx.guild_id}")
             await self._delete_menu_message(ctx, guild['current_menu'], ctx.guild_id)
 
-        await self.init_menu_view(ctx, ctx.guild_id, disable=disable)
-        interaction = await self.respond(ctx, embed=embed, view=self.menu_views[ctx.guild_id])
+        interaction = await self.respond(ctx, embed=embed, view=await self.build_menu_view(ctx, disable=disable))
         response = await interaction.original_response() if isinstance(interaction, discord.Interaction) else interaction
 
         if response:
             await self.db.update(ctx.guild_id, {'current_menu': response.id})
+            # Interaction messages are edited with the interaction token which expires, so edit as a regular message
+            self.menu_messages[ctx.guild_id] = response.channel.get_partial_message(response.id)  # type: ignore
             logging.info(f"[VC_EXT] New menu message {response.id} created in guild {ctx.guild_id}")
         else:
             logging.warning(f"[VC_EXT] Failed to save menu message id. Invalid response.")
 
         return True
     
-    async def get_menu_message(self, ctx: ApplicationContext | Interaction | RawReactionActionEvent, menu_mid: int) -> discord.Message | None:
-        """Fetch the menu message by its id. Return the message if found.
-        Reset `current_menu` field in the database if not found.
+    async def get_menu_message(
+        self,
+        ctx: ApplicationContext | Interaction | RawReactionActionEvent,
+        menu_mid: int
+    ) -> discord.Message | discord.PartialMessage | None:
+        """Get the menu message by its id. Return the message if found.
+        Use the cached message if present, otherwise fetch it. Reset `current_menu` field in the database if not found.
 
         Args:
             ctx (ApplicationContext | Interaction | RawReactionActionEvent): Context.
             menu_mid (int): Id of the menu message to fetch.
 
         Returns:
-            (discord.Message | None): Menu message or None.
+            (discord.Message | discord.PartialMessage | None): Menu message or None.
         """
-        logging.debug(f"[VC_EXT] Fetching menu message {menu_mid} in guild {ctx.guild_id}")
-
         if not ctx.guild_id:
             logging.warning("[VC_EXT] Guild ID not found in context")
             return None
 
+        if (menu := self.menu_messages.get(ctx.guild_id)) and menu.id == menu_mid:
+            return menu
+
+        logging.debug(f"[VC_EXT] Fetching menu message {menu_mid} in guild {ctx.guild_id}")
+
         try:
             menu = await self.get_message_by_id(ctx, menu_mid)
         except discord.DiscordException:
@@ -102,28 +120,30 @@ class VoiceExtension(BaseBot):
 
         if not menu:
             logging.debug(f"[VC_EXT] Menu message {menu_mid} not found in guild {ctx.guild_id}")
+            self.forget_menu_message(ctx.guild_id)
             await self.db.update(ctx.guild_id, {'current_menu': None})
             return None
 
         logging.debug(f"[VC_EXT] Menu message {menu_mid} successfully fetched")
+        self.menu_messages[ctx.guild_id] = menu
         return menu
     
     async def update_menu_embed_and_view(
         self,
         ctx: ApplicationContext | Interaction | RawReactionActionEvent,
         *,
-        menu_message: discord.Message | None = None,
+        menu_message: discord.Message | discord.PartialMessage | None = None,
         button_callback: bool = False
     ) -> bool:
         """Update embed and view of the current menu message. Return True if updated.
 
         Args:
             ctx (ApplicationContext | Interaction | RawReactionActionEvent): Context.
-            menu_message (discord.Message | None): Message to update. If None, fetches menu from channel using `menu_mid`. Defaults to None.
+            menu_message (discord.Message | discord.PartialMessage | None): Message to update. If None, fetches menu from channel using `menu_mid`. Defaults to None.
             button_callback (bool, optional): Should be True if the function is being called from button callback. Defaults to False.
 
         Returns:
-           bool: True if updated, False if not.
+           bool: True if updated or the edit was scheduled, False if not.
         """
         logging.info(
             f"[VC_EXT] Updating menu embed using " + (
@@ -172,17 +192,17 @@ class VoiceExtension(BaseBot):
         else:
             embed.remove_footer()
 
-        await self.menu_views[ctx.guild_id].update()
-        try:
-            if isinstance(ctx, Interaction) and button_callback:
-                # If interaction from menu buttons
-                await ctx.edit(embed=embed, view=self.menu_views[ctx.guild_id])
-            else:
-                # If interaction from other buttons or commands. They should have their own response.
-                await menu_message.edit(embed=embed, view=self.menu_views[ctx.guild_id])
-        except discord.DiscordException as e:
-            logging.warning(f"[VC_EXT] Error while updating menu message: {e}")
-            return False
+        view = await self.build_menu_view(ctx)
+        if isinstance(ctx, Interaction) and button_callback:
+            # If interaction from menu buttons
+            try:
+                await self.edit_menu_from_interaction(ctx, embed=embed, view=view)
+            except discord.DiscordException as e:
+                logging.warning(f"[VC_EXT] Error while updating menu message: {e}")
+                return False
+        else:
+            # If interaction from other buttons or commands. They should have their own response.
+            self._menu_edits.schedule(ctx.guild_id, menu_message, embed=embed, view=view)
 
         logging.debug("[VC_EXT] Menu embed updated successfully")
         return True
@@ -202,7 +222,7 @@ class VoiceExtension(BaseBot):
             disable (bool, optional): Disable the view if True. Defaults to False.
 
         Returns:
-            bool: True if the view was updated, False otherwise.
+            bool: True if the view was updated or the edit was scheduled, False otherwise.
         """
         logging.debug("[VC_EXT] Updating menu view")
         
@@ -216,29 +236,37 @@ class VoiceExtension(BaseBot):
             logging.warning("[VC_EXT] Current menu not found in guild data")
             return False
 
-        if ctx.guild_id not in self.menu_views:
-            logging.debug("[VC_EXT] Creating new menu view")
-            await self.init_menu_view(ctx, ctx.guild_id, disable=disable)
+        view = await self.build_menu_view(ctx, disable=disable)
 
-        view = self.menu_views[ctx.guild_id]
-        await view.update(disable=disable)
-
-        try:
-            if isinstance(ctx, Interaction) and button_callback:
-                # If interaction from menu buttons
-                await ctx.edit(view=view)
-            else:
-                # If interaction from other buttons or commands. They should have their own response.
-                if (menu_message := await self.get_menu_message(ctx, guild['current_menu'])):
-                    await menu_message.edit(view=view)
-
-        except discord.DiscordException as e:
-            logging.warning(f"[VC_EXT] Error while updating menu view: {e}")
-            return False
+        if isinstance(ctx, Interaction) and button_callback:
+            # If interaction from menu buttons
+            try:
+                await self.edit_menu_from_interaction(ctx, view=view)
+            except discord.DiscordException as e:
+                logging.warning(f"[VC_EXT] Error while updating menu view: {e}")
+                return False
+        else:
+            # If interaction from other buttons or commands. They should have their own response.
+            if (menu_message := await self.get_menu_message(ctx, guild['current_menu'])):
+                self._menu_edits.schedule(ctx.guild_id, menu_message, view=view)
 
         logging.debug("[VC_EXT] Menu view updated successfully")
         return True
     
+    async def edit_menu_from_interaction(self, interaction: Interaction, **fields: Any) -> None:
+        """Edit the menu message in response to the interaction with its component and remember the new state.
+
+        Args:
+            interaction (Interaction): Interaction from the menu message.
+            **fields (Any): Arguments of `Interaction.edit`.
+
+        Raises:
+            discord.DiscordException: Failed to edit the message.
+        """
+        await interaction.edit(**fields)
+        if interaction.guild_id and interaction.message:
+            self._menu_edits.rendered(interaction.guild_id, interaction.message.id, **fields)
+
     async def update_vibe(
         self,
         ctx: ApplicationContext | Interaction | RawReactionActionEvent,
@@ -300,10 +328,11 @@ class VoiceExtension(BaseBot):
                 logging.warning(f"[VIBE] Failed to start radio '{vibe_type}:{item_id}'")
                 return False
 
-        tracks = await client.rotor_station_tracks(
-            f"{vibe_type}:{item_id}",
-            queue=guild['current_track']['id'] if guild['current_track'] else None  # type: ignore
-        )
+        with ym_priority(Priority.PLAYBACK):
+            tracks = await client.rotor_station_tracks(
+                f"{vibe_type}:{item_id}",
+                queue=guild['current_track']['id'] if guild['current_track'] else None  # type: ignore
+            )
 
         if not tracks:
             logging.warning("[VIBE] Failed to get next vibe tracks")
@@ -476,9 +505,9 @@ class VoiceExtension(BaseBot):
         vc.stop()
 
         if full:
-            guild = await self.db.get_guild(ctx.guild_id, projection={'current_menu': 1, 'current_track': 1, 'vibing': 1})
+            guild = await self.db.get_guild(ctx.guild_id, projection={'current_menu': 1, 'current_track': 1, 'vibing': 1, 'current_viber_id': 1})
             if guild['vibing'] and guild['current_track']:
-                await self.send_vibe_feedback(ctx, 'trackFinished', guild['current_track'])
+                await self.queue_vibe_feedback(ctx, 'trackFinished', guild['current_track'], viber_id=guild['current_viber_id'])
                 
             await self.db.update(ctx.guild_id, {
                 'current_menu': None, 'repeat': False, 'shuffle': False,
@@ -537,7 +566,7 @@ class VoiceExtension(BaseBot):
                 await self.respond(ctx, "error", "Не удалось обновить меню.", ephemeral=True, delete_after=15)
 
         if guild['vibing'] and guild['current_track']:
-            await self.send_vibe_feedback(ctx, 'trackFinished' if after else 'skip', guild['current_track'])
+            await self.queue_vibe_feedback(ctx, 'trackFinished' if after else 'skip', guild['current_track'], viber_id=uid)
 
         if guild['repeat'] and after:
             logging.debug("[VC_EXT] Repeating current track")
@@ -551,17 +580,27 @@ class VoiceExtension(BaseBot):
 
         if not next_track and guild['vibing']:
             # NOTE: Real vibe gets next tracks after each skip. For smoother experience
-            #       we get next tracks only after all the other tracks are finished
+            #       we prefetch next batch in background when the queue is almost empty.
+            #       This is the fallback if the queue ran out anyway.
 
-            logging.debug("[VC_EXT] No next track found, generating new vibe")
+            if (prefetch := self._vibe_prefetches.get(ctx.guild_id)):
+                logging.debug("[VC_EXT] No next track found, waiting for vibe prefetch")
+                await asyncio.shield(prefetch)
+                next_track = await self.db.get_track(ctx.guild_id, 'next')
 
-            user = await self.users_db.get_user(uid)
-            if not user['vibe_type'] or not user['vibe_id']:
-                logging.warning("[VC_EXT] No vibe type or vibe id found in user data")
-                return None
+            if not next_track:
+                logging.debug("[VC_EXT] No next track found, generating new vibe")
 
-            await self.update_vibe(ctx, user['vibe_type'], user['vibe_id'])
-            next_track = await self.db.get_track(ctx.guild_id, 'next')
+                user = await self.users_db.get_user(uid)
+                if not user['vibe_type'] or not user['vibe_id']:
+                    logging.warning("[VC_EXT] No vibe type or vibe id found in user data")
+                    return None
+
+                await self.update_vibe(ctx, user['vibe_type'], user['vibe_id'])
+                next_track = await self.db.get_track(ctx.guild_id, 'next')
+
+        if guild['vibing'] and await self.db.get_track_count(ctx.guild_id, 'next') < VIBE_PREFETCH_THRESHOLD:
+            self._schedule_vibe_prefetch(ctx, uid)
 
         if next_track:
             return await self.play_track(ctx, next_track, vc=vc, button_callback=button_callback)
@@ -575,6 +614,75 @@ class VoiceExtension(BaseBot):
 
         return None
 
+    def _schedule_vibe_prefetch(self, ctx: ApplicationContext | Interaction | RawReactionActionEvent, uid: int) -> None:
+        """Start fetching next vibe batch in background unless it's already being fetched for this guild."""
+        if not (gid := ctx.guild_id) or gid in self._vibe_prefetches:
+            return
+
+        logging.debug(f"[VIBE] Scheduling vibe prefetch for guild {gid}")
+        task = asyncio.create_task(self._prefetch_vibe(gid, uid))
+        task.add_done_callback(lambda _: self._vibe_prefetches.pop(gid, None))
+        self._vibe_prefetches[gid] = task
+
+    async def _prefetch_vibe(self, gid: int, uid: int) -> None:
+        """Fetch next vibe batch and append tracks that are not in the queue or history to the queue.
+        If every track of the batch was already played, the whole batch is appended.
+
+        Args:
+            gid (int): Guild ID.
+            uid (int): ID of the user who started vibe.
+        """
+        try:
+            user = await self.users_db.get_user(uid, projection={'vibe_type': 1, 'vibe_id': 1})
+            if not (station := f"{user['vibe_type']}:{user['vibe_id']}" if user['vibe_type'] and user['vibe_id'] else None):
+                return
+
+            # The context may be long finished, so the client is resolved without responding to it
+            guild = await self.db.get_guild(gid, projection={'current_track': 1, 'single_token_uid': 1})
+            if not (token := await self.users_db.get_ym_token(guild['single_token_uid'] or uid)):
+                logging.info(f"[VIBE] No token found for vibe prefetch in guild {gid}")
+                return
+
+            try:
+                client = await self._ym_clients.get(token)
+            except yandex_music.exceptions.UnauthorizedError:
+                logging.info(f"[VIBE] Invalid token for vibe prefetch in guild {gid}")
+                return
+
+            with ym_priority(Priority.PLAYBACK):
+                tracks = await client.rotor_station_tracks(
+                    station,
+                    queue=guild['current_track']['id'] if guild['current_track'] else None  # type: ignore
+                )
+
+            if not tracks:
+                logging.warning("[VIBE] Failed to prefetch next vibe tracks")
+                return
+
+            # Station could be stopped or changed while the batch was being fetched
+            guild = await self.db.get_guild(gid, projection={'vibing': 1, 'current_track': 1, 'next_tracks': 1, 'previous_tracks': 1})
+            user = await self.users_db.get_user(uid, projection={'vibe_type': 1, 'vibe_id': 1})
+            if not guild['vibing'] or f"{user['vibe_type']}:{user['vibe_id']}" != station:
+                logging.debug("[VIBE] Vibe changed during prefetch, discarding batch")
+                return
+
+            known_ids = {str(track['id']) for track in guild['next_tracks'] + guild['previous_tracks']}
+            if guild['current_track']:
+                known_ids.add(str(guild['current_track']['id']))
+
+            batch = [cast(Track, track.track) for track in tracks.sequence if track.track]
+            if not (next_tracks := [track for track in batch if str(track.id) not in known_ids]):
+                # Narrow stations repeat tracks. Playing them again is better than stopping the vibe
+                logging.debug("[VIBE] Every prefetched track was already played, keeping the batch")
+                next_tracks = batch
+            logging.debug(f"[VIBE] Prefetched vibe tracks: {[track.title for track in next_tracks]}")
+
+            await self.users_db.update(uid, {'vibe_batch_id': tracks.batch_id})
+            if next_tracks:
+                await self.db.modify_track(gid, next_tracks, 'next', 'extend')
+        except Exception as e:
+            logging.error(f"[VIBE] Vibe prefetch failed for guild {gid}: {e}")
+
     async def play_previous_track(
         self,
         ctx: ApplicationContext | Interaction | RawReactionActionEvent,
@@ -616,39 +724,35 @@ class VoiceExtension(BaseBot):
 
         return None
 
-    async def get_reacted_tracks(
+    async def get_reacted_track_ids(
         self,
         ctx: ApplicationContext | Interaction | RawReactionActionEvent,
         tracks_type: Literal['like', 'dislike']
-    ) -> list[TrackShort]:
-        """Get liked or disliked tracks from Yandex Music. Return list of tracks on success.
-        Return empty list if no likes found or error occurred.
+    ) -> set[str]:
+        """Get ids of liked or disliked tracks from cache. The library is refreshed only if its revision changed.
+        Return empty set if no likes found or error occurred.
         
         Args:
             ctx (ApplicationContext | Interaction | RawReactionActionEvent): Context.
             tracks_type (Literal['like', 'dislike']): Type of tracks to get.
         
         Returns:
-            list[TrackShort]: List of tracks.
+            set[str]: Track ids.
         """
-        logging.info("[VC_EXT] Getting liked tracks")
+        logging.info(f"[VC_EXT] Getting {tracks_type}d track ids")
 
         if not ctx.guild_id:
             logging.warning("Guild ID not found in context")
-            return []
-
-        if not await self.db.get_track(ctx.guild_id, 'current'):
-            logging.debug("[VC_EXT] Current track not found. Likes can't be fetched")
-            return []
+            return set()
 
         if not (client := await self.init_ym_client(ctx)):
-            return []
+            return set()
 
-        if not (collection := await client.users_likes_tracks() if tracks_type == 'like' else await client.users_dislikes_tracks()):
+        if not (ids := await self._reactions.get(client, tracks_type)):
             logging.info(f"[VC_EXT] No {tracks_type}s found")
-            return []
+            return set()
 
-        return collection.tracks
+        return ids
     
     async def proccess_vote(
         self,
@@ -686,11 +790,10 @@ class VoiceExtension(BaseBot):
                 return False
 
         elif vote_data['action'] == 'add_track':
-            if not vote_data['vote_content']:
-                logging.info(f"[VOICE] Recieved empty vote context for message {ctx.message_id}")
+            if not (tracks := await self._fetch_vote_tracks(ctx, vote_data)):
                 return False
 
-            await self.db.modify_track(guild['_id'], vote_data['vote_content'], 'next', 'append')
+            await self.db.modify_track(guild['_id'], tracks[0], 'next', 'append')
 
             if guild['current_track']:
                 await self.respond(ctx, "success", "Трек был добавлен в очередь!", delete_after=15)
@@ -699,12 +802,11 @@ class VoiceExtension(BaseBot):
                 return False
 
         elif vote_data['action'] in ('add_album', 'add_artist', 'add_playlist'):
-            if not vote_data['vote_content']:
-                logging.info(f"[VOICE] Recieved empty vote context for message {ctx.message_id}")
+            if not (tracks := await self._fetch_vote_tracks(ctx, vote_data)):
                 return False
 
             await self.db.update(guild['_id'], {'is_stopped': False})
-            await self.db.modify_track(guild['_id'], vote_data['vote_content'], 'next', 'extend')
+            await self.db.modify_track(guild['_id'], tracks, 'next', 'extend')
 
             if guild['current_track']:
                 await self.respond(ctx, "success", "Контент был добавлен в очередь!", delete_after=15)
@@ -763,16 +865,76 @@ class VoiceExtension(BaseBot):
 
         return True
 
-    async def send_vibe_feedback(
+    async def _fetch_vote_tracks(self, ctx: RawReactionActionEvent, vote_data: MessageVotes) -> list[Track] | None:
+        """Fetch tracks referenced by `vote_content` of the vote and respond on failure."""
+        if not isinstance(vote_data['vote_content'], dict):
+            logging.info(f"[VOICE] Recieved empty vote context for message {ctx.message_id}")
+            return None
+
+        content = cast(ContentReference, vote_data['vote_content'])
+
+        # The voter who decided the vote may have no token or no access to the content
+        if not (requester_id := content.get('requester_id')) or not (client := await self.get_user_ym_client(requester_id)):
+            if not (client := await self.init_ym_client(ctx)):
+                return None
+
+        if not (tracks := await self.fetch_content_tracks(client, content)):
+            logging.info(f"[VOICE] Failed to fetch tracks for message {ctx.message_id}")
+            await self.respond(ctx, "error", "Не удалось получить треки.", delete_after=15)
+            return None
+
+        return tracks
+
+    async def queue_vibe_feedback(
         self,
         ctx: ApplicationContext | Interaction | RawReactionActionEvent,
         feedback_type: Literal['radioStarted', 'trackStarted', 'trackFinished', 'skip'],
+        track: Track | dict[str, Any],
+        *,
+        viber_id: int | None = None
+    ) -> None:
+        """Queue vibe feedback to be sent in background with `send_vibe_feedback`.
+        Feedback of the same guild is delivered in order. User, station and token are resolved when queued,
+        so a delayed send doesn't depend on the context.
+
+        Args:
+            ctx (ApplicationContext | Interaction | RawReactionActionEvent): Context.
+            feedback_type (str): Type of feedback. Can be 'radioStarted', 'trackStarted', 'trackFinished', 'skip'.
+            track (Track | dict[str, Any]): Track data.
+            viber_id (int | None, optional): ID of the user who started vibe. Fetched from context if None. Defaults to None.
+        """
+        logging.debug(f"[VC_EXT] Queueing vibe feedback, type: {feedback_type}")
+
+        if not (uid := viber_id or await self.get_viber_id_from_ctx(ctx)) or not ctx.guild_id:
+            logging.warning("[VC_EXT] User id or guild id not found")
+            return
+
+        if not (token := await self.get_ym_token(ctx)):
+            logging.info("[VC_EXT] No token found, vibe feedback is not sent")
+            return
+
+        user = await self.users_db.get_user(uid, projection={'vibe_batch_id': 1, 'vibe_type': 1, 'vibe_id': 1})
+        station = f"{user['vibe_type']}:{user['vibe_id']}"
+
+        self._feedback_queue.put(
+            ctx.guild_id,
+            lambda: self.send_vibe_feedback(token, station, user['vibe_batch_id'], feedback_type, track)
+        )
+
+    async def send_vibe_feedback(
+        self,
+        token: str,
+        station: str,
+        batch_id: str | None,
+        feedback_type: Literal['radioStarted', 'trackStarted', 'trackFinished', 'skip'],
         track: Track | dict[str, Any]
     ) -> bool:
         """Send vibe feedback to Yandex Music. Return True on success.
 
         Args:
-            ctx (ApplicationContext | Interaction | RawReactionActionEvent): Context.
+            token (str): Yandex Music token.
+            station (str): Station id, e.g. 'user:onyourwave'.
+            batch_id (str | None): Batch id of the track.
             feedback_type (str): Type of feedback. Can be 'radioStarted', 'trackStarted', 'trackFinished', 'skip'.
             track (Track | dict[str, Any]): Track data.
 
@@ -781,28 +943,26 @@ class VoiceExtension(BaseBot):
         """
         logging.debug(f"[VC_EXT] Sending vibe feedback, type: {feedback_type}")
 
-        if not (uid := await self.get_viber_id_from_ctx(ctx)) or not ctx.guild_id:
-            logging.warning("[VC_EXT] User id or guild id not found")
+        try:
+            client = await self._ym_clients.get(token)
+        except yandex_music.exceptions.UnauthorizedError:
+            logging.info("[VC_EXT] Invalid token, vibe feedback is not sent")
             return False
 
-        user = await self.users_db.get_user(uid, projection={'vibe_batch_id': 1, 'vibe_type': 1, 'vibe_id': 1})
-
-        if not (client := await self.init_ym_client(ctx)):
-            return False
-        
         if feedback_type not in ('radioStarted', 'trackStarted') and track['duration_ms']:
             total_play_seconds = track['duration_ms'] // 1000
         else:
             total_play_seconds = None
             
         try:
-            feedback = await client.rotor_station_feedback(
-                f'{user['vibe_type']}:{user['vibe_id']}',
-                feedback_type,
-                track_id=track['id'],
-                total_played_seconds=total_play_seconds,  # type: ignore
-                batch_id=user['vibe_batch_id']  # type: ignore
-            )
+            with ym_priority(Priority.FEEDBACK):
+                feedback = await client.rotor_station_feedback(
+                    station,
+                    feedback_type,
+                    track_id=track['id'],
+                    total_played_seconds=total_play_seconds,  # type: ignore
+                    batch_id=batch_id  # type: ignore
+                )
         except yandex_music.exceptions.BadRequestError as e:
             logging.error(f"[VC_EXT] Failed to send vibe feedback, type: {feedback_type}, track: {track['title']} error: {e}")
             return False
@@ -817,19 +977,83 @@ class VoiceExtension(BaseBot):
             gid (int): Guild ID.
             track (Track): Track to download.
         """
+        # Available quality depends on subscription, so tracks are shared only between clients with the same one.
+        me = track.client.me if track.client else None
+        has_plus = bool(me and me.plus and me.plus.has_plus)
+
         try:
-            await track.download_async(f'music/{gid}.mp3')
+            with ym_priority(Priority.PLAYBACK):
+                track_bytes = await self._flights.do(('download', track.id, has_plus), lambda: self._download_track_bytes(track, has_plus))
         except yandex_music.exceptions.TimedOutError:
             logging.warning(f"[VC_EXT] Timed out while downloading track '{track.title}'")
             raise
+
+        async with aiofiles.open(f'music/{gid}.mp3', 'wb') as f:
+            await f.write(track_bytes)
     
+    async def _download_track_bytes(self, track: Track, has_plus: bool, codec: str = 'mp3', bitrate: int = 192) -> bytes:
+        """Download track using cached direct link if available. Retry once with a new link if the cached one failed.
+
+        Args:
+            track (Track): Track to download.
+            has_plus (bool): Whether track client has subscription.
+            codec (str, optional): Codec. Defaults to 'mp3'.
+            bitrate (int, optional): Bitrate in kbps. Defaults to 192.
+
+        Raises:
+            InvalidBitrateError: Track has no download info with given codec and bitrate.
+            NetworkError: Failed to download track.
+
+        Returns:
+            bytes: Track content.
+        """
+        key = (str(track.id), codec, bitrate, has_plus)
+        client = cast(YMClient, track.client)
+
+        link, cached = await self._get_direct_link(track, key)
+        try:
+            return await client.request.retrieve(link)
+        except yandex_music.exceptions.TimedOutError:
+            raise
+        except yandex_music.exceptions.NetworkError as e:
+            if not cached:  # The link is fresh, resolving it again won't help
+                raise
+
+            logging.debug(f"[VC_EXT] Cached download link for track '{track.title}' failed: {e}")
+            self._download_links.pop(key)  # TTLCache.pop doesn't raise on missing keys
+            self._download_infos.pop((key[0], has_plus))
+
+        link, _ = await self._get_direct_link(track, key)
+        return await client.request.retrieve(link)
+
+    async def _get_direct_link(self, track: Track, key: tuple[str, str, int, bool]) -> tuple[str, bool]:
+        """Return direct link for `key` and whether it was served from cache.
+        A new link is resolved using cached download info if needed."""
+        if (link := self._download_links.get(key)):
+            return link, True
+
+        track_id, codec, bitrate, has_plus = key
+        if (infos := self._download_infos.get((track_id, has_plus))) is None:
+            infos = await track.get_download_info_async()
+            self._download_infos.set((track_id, has_plus), infos)
+
+        for info in infos:
+            if info.codec == codec and info.bitrate_in_kbps == bitrate:
+                break
+        else:
+            raise yandex_music.exceptions.InvalidBitrateError(f"Unavailable bitrate {bitrate} for codec {codec}")
+
+        link = await info.get_direct_link_async()
+        self._download_links.set(key, link)
+        return link, False
+
     async def _delete_menu_message(
         self,
         ctx: ApplicationContext | Interaction | RawReactionActionEvent,
         current_menu: int,
         gid: int
     ) -> Literal[True]:
-        """Delete current menu message and stop menu view. Return True on success.
+        """Delete current menu message. Return True on success.
 
         Args:
             ctx (ApplicationContext | Interaction | RawReactionActionEvent): Context.
@@ -841,12 +1065,13 @@ class VoiceExtension(BaseBot):
         """
         logging.debug("[VC_EXT] Performing full stop")
 
-        if gid in self.menu_views:
-            self.menu_views[gid].stop()
-            del self.menu_views[gid]
-
+        self._menu_edits.cancel(gid)
         if (menu := await self.get_menu_message(ctx, current_menu)):
-            await menu.delete()
+            self.forget_menu_message(gid)
+            try:
+                await menu.delete()
+            except discord.NotFound:
+                logging.debug(f"[VC_EXT] Menu message {current_menu} was already deleted")
 
         return True
         
@@ -877,7 +1102,7 @@ class VoiceExtension(BaseBot):
             logging.warning("Guild ID or User ID not found in context")
             return None
 
-        guild = await self.db.get_guild(ctx.guild_id, projection={'current_menu': 1, 'vibing': 1, 'current_track': 1})
+        guild = await self.db.get_guild(ctx.guild_id, projection={'current_menu': 1, 'vibing': 1, 'current_track': 1, 'current_viber_id': 1})
 
         if not (vc := await self.get_voice_client(ctx) if not vc else vc):
             return None
@@ -923,6 +1148,6 @@ class VoiceExtension(BaseBot):
         await self.db.update(ctx.guild_id, {'is_stopped': False})
 
         if guild['vibing']:
-            await self.send_vibe_feedback(ctx, 'trackStarted', track)
+            await self.queue_vibe_feedback(ctx, 'trackStarted', track, viber_id=guild['current_viber_id'])
 
         return track.title
@@ -0,0 +1,143 @@
+import logging
+from collections import OrderedDict
+from time import monotonic
+from typing import Any
+
+from yandex_music import ClientAsync as YMClient
+from yandex_music.exceptions import UnauthorizedError
+from yandex_music.utils.request_async import Request
+
+from MusicBot.cogs.utils.metrics import metrics
+from MusicBot.cogs.utils.scheduler import RequestScheduler
+
+class PoolRequest(Request):
+    """Request used by pooled clients. Waits for the pool scheduler before each request
+    and expires client validation when the API responds with `UnauthorizedError`."""
+
+    def __init__(self, pool: 'YMClientPool', *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.pool = pool
+
+    async def _request_wrapper(self, *args: Any, **kwargs: Any) -> bytes:
+        if self.client and self.client.token:
+            await self.pool.scheduler.acquire(self.client.token)
+
+        try:
+            return await super()._request_wrapper(*args, **kwargs)
+        except UnauthorizedError:
+            if self.client and self.client.token:
+                self.pool.expire(self.client.token)
+            raise
+
+class YMClientPool:
+    """LRU registry of initialized Yandex Music clients by token.
+
+    Cached clients are validated with `account_status()` once per `validation_ttl` seconds
+    or after one of their requests failed with `UnauthorizedError`.
+
+    Requests of pooled clients are rate limited per token by `scheduler`.
+
+    The pool holds at most `max_size` clients. Least recently used clients are evicted when it's full,
+    and clients not used for `idle_timeout` seconds are evicted on the next access to the pool.
+    """
+
+    def __init__(
+        self,
+        validation_ttl: float = 600,
+        max_size: int = 256,
+        idle_timeout: float = 3600,
+        scheduler: RequestScheduler | None = None
+    ) -> None:
+        self.validation_ttl = validation_ttl
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.scheduler = scheduler or RequestScheduler()
+        self._clients: OrderedDict[str, YMClient] = OrderedDict()
+        self._validated_at: dict[str, float] = {}
+        self._used_at: dict[str, float] = {}
+
+    async def get(self, token: str) -> YMClient:
+        """Return client for `token`. Initialize it if not cached and validate it if validation expired.
+
+        Args:
+            token (str): Yandex Music token.
+
+        Returns:
+            YMClient: Initialized client.
+
+        Raises:
+            UnauthorizedError: Token is invalid. Client is removed from the pool.
+        """
+        self._evict_idle()
+
+        try:
+            if (client := self._clients.get(token)):
+                metrics.inc('ym_clients.hits')
+                self._touch(token)
+
+                if monotonic() - self._validated_at[token] >= self.validation_ttl:
+                    logging.debug("[YM_CLIENTS] Validating cached client")
+                    metrics.inc('ym_clients.validations')
+                    await client.account_status()
+                    self._validated_at[token] = monotonic()
+
+                return client
+
+            logging.debug("[YM_CLIENTS] Initializing new client")
+            metrics.inc('ym_clients.misses')
+            client = await YMClient(token, request=PoolRequest(self)).init()
+        except UnauthorizedError:
+            logging.debug("[YM_CLIENTS] Client token is invalid")
+            self.remove(token)
+            raise
+
+        self._clients[token] = client
+        self._validated_at[token] = monotonic()
+        self._touch(token)
+
+        while len(self._clients) > self.max_size:
+            oldest = next(iter(self._clients))
+            logging.debug("[YM_CLIENTS] Pool is full, evicting least recently used client")
+            metrics.inc('ym_clients.evicted')
+            self.remove(oldest)
+
+        self._update_gauge()
+        return client
+
+    def expire(self, token: str) -> None:
+        """Force validation of the client on the next `get`."""
+        if token in self._validated_at:
+            metrics.inc('ym_clients.expired')
+            self._validated_at[token] = float('-inf')
+
+    def remove(self, token: str) -> None:
+        """Remove client from the pool if present."""
+        self._clients.pop(token, None)
+        self._validated_at.pop(token, None)
+        self._used_at.pop(token, None)
+        self._update_gauge()
+
+    def _touch(self, token: str) -> None:
+        self._clients.move_to_end(token)
+        self._used_at[token] = monotonic()
+
+    def _evict_idle(self) -> None:
+        """Remove clients that were not used for `idle_timeout` seconds. Clients are ordered by last use."""
+        now = monotonic()
+        while self._clients:
+            oldest = next(iter(self._clients))
+            if now - self._used_at[oldest] < self.idle_timeout:
+                break
+
+            logging.debug("[YM_CLIENTS] Evicting idle client")
+            metrics.inc('ym_clients.idle_evicted')
+            self.remove(oldest)
+
+    def _update_gauge(self) -> None:
+        metrics.set_gauge('ym_clients.live', len(self._clients))
+
+    def __contains__(self, token: str) -> bool:
+        return token in self._clients
+
+    def __len__(self) -> int:
+        return len(self._clients)
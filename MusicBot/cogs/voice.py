@@ -4,34 +4,48 @@ from typing import cast
 import discord
 from discord.ext.commands import Cog
 
-from yandex_music import ClientAsync as YMClient
 from yandex_music.exceptions import UnauthorizedError
 
-from MusicBot.cogs.utils import VoiceExtension
+from MusicBot.cogs.utils import BaseBot, VoiceExtension
+from MusicBot.cogs.utils.autocomplete import AutocompleteEngine
+from MusicBot.cogs.utils.stations import StationCatalogue
 from MusicBot.database import BaseUsersDatabase
-from MusicBot.ui import QueueView, generate_queue_embed
+from MusicBot.ui import QueueView, QUEUE_PAGE_SIZE, generate_queue_embed
 
 def setup(bot: discord.Bot):
     bot.add_cog(Voice(bot))
 
 users_db = BaseUsersDatabase()
+autocomplete = AutocompleteEngine()
+stations = StationCatalogue()
 
 async def get_vibe_stations_suggestions(ctx: discord.AutocompleteContext) -> list[str]:
     if not ctx.interaction.user or not ctx.value or len(ctx.value) < 2:
         return []
 
-    if not (token := await users_db.get_ym_token(ctx.interaction.user.id)):
-        logging.info(f"[GENERAL] User {ctx.interaction.user.id} has no token")
-        return []
+    uid = ctx.interaction.user.id
+    res = await autocomplete.suggest(
+        (uid, 'stations'),
+        ctx.value,
+        lambda value: _fetch_vibe_stations_suggestions(uid, value)
+    )
+    return res[:100]
 
-    try:
-        client = await YMClient(token).init()
-    except UnauthorizedError:
-        logging.info(f"[GENERAL] User {ctx.interaction.user.id} provided invalid token")
-        return []
+async def _fetch_vibe_stations_suggestions(uid: int, value: str) -> list[str] | None:
+    if stations.expired:
+        if not (token := await users_db.get_ym_token(uid)):
+            logging.info(f"[GENERAL] User {uid} has no token")
+            return None
 
-    stations = await client.rotor_stations_list()
-    return [station.station.name for station in stations if station.station and ctx.value in station.station.name][:100]
+        try:
+            client = await BaseBot._ym_clients.get(token)
+        except UnauthorizedError:
+            logging.info(f"[GENERAL] User {uid} provided invalid token")
+            return None
+
+        await stations.refresh(client)
+
+    return stations.suggest(value)
 
 
 class Voice(Cog, VoiceExtension):
@@ -74,11 +88,8 @@ class Voice(Cog, VoiceExtension):
         if len(after.channel.members) == 1:
             logging.info(f"[VOICE] Clearing history and stopping playback for guild {member.guild.id}")
 
-            if member.guild.id in self.menu_views:
-                self.menu_views[member.guild.id].stop()
-                del self.menu_views[member.guild.id]
-
             if guild['current_menu']:
+                self.forget_menu_message(member.guild.id)
                 if (message := self.typed_bot.get_message(guild['current_menu'])):
                     await message.delete()
 
@@ -89,9 +100,15 @@ class Voice(Cog, VoiceExtension):
             })
             vc.stop()
 
-            if member.guild.id in self.menu_views:
-                self.menu_views[member.guild.id].stop()
-                del self.menu_views[member.guild.id]
+    @Cog.listener()
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        if payload.guild_id:
+            self.forget_menu_message(payload.guild_id, payload.message_id)
+
+    @Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload: discord.RawBulkMessageDeleteEvent) -> None:
+        if payload.guild_id and (menu := self.menu_messages.get(payload.guild_id)) and menu.id in payload.message_ids:
+            self.forget_menu_message(payload.guild_id)
 
     @Cog.listener()
     async def on_raw_reaction_add(self, payload: discord.RawReactionActionEvent) -> None:
@@ -344,12 +361,12 @@ class Voice(Cog, VoiceExtension):
         if not await self.voice_check(ctx):
             return
 
-        tracks = await self.db.get_tracks_list(ctx.guild_id, 'next')
-        if len(tracks) == 0:
+        tracks, total = await self.db.get_tracks_page(ctx.guild_id, 'next', 0, QUEUE_PAGE_SIZE)
+        if total == 0:
             await self.respond(ctx, "error", "Очередь прослушивания пуста.", delete_after=15, ephemeral=True)
             return
 
-        await ctx.respond(embed=generate_queue_embed(0, tracks), view=QueueView(ctx, tracks), ephemeral=True)
+        await ctx.respond(embed=generate_queue_embed(0, tracks, total), view=QueueView(ctx, tracks, total), ephemeral=True)
 
         logging.info(f"[VOICE] Queue embed sent to user {ctx.author.id} in guild {ctx.guild_id}")
 
@@ -421,26 +438,17 @@ class Voice(Cog, VoiceExtension):
             if not (client := await self.init_ym_client(ctx)):
                 return
 
-            for content in (await client.rotor_stations_list()):
-                if content.station and content.station.name == name and content.ad_params:
-                    break
-            else:
-                content = None
+            await stations.refresh(client)
 
-            if not content:
+            if not (station := stations.resolve(name)):
                 logging.debug(f"[VOICE] Station {name} not found")
                 await self.respond(ctx, "error", "Станция не найдена.", delete_after=15, ephemeral=True)
                 return
 
-            vibe_type, vibe_id = content.ad_params.other_params.split(':') if content.ad_params else (None, None)
-
-            if not vibe_type or not vibe_id:
-                logging.debug(f"[VOICE] Station {name} has no ad params")
-                await self.respond(ctx, "error", "Станция не найдена.", delete_after=15, ephemeral=True)
-                return
+            vibe_type, vibe_id = station.type, station.id
         else:
             vibe_type, vibe_id = 'user', 'onyourwave'
-            content = None
+            station = None
 
         member = cast(discord.Member, ctx.author)
         channel = cast(discord.VoiceChannel, ctx.channel)
@@ -451,15 +459,15 @@ class Voice(Cog, VoiceExtension):
             logging.info(f"Starting vote for starting vibe in guild {ctx.guild_id}")
 
             if vibe_type == 'user' and vibe_id == 'onyourwave':
-                station = "Моя Волна"
-            elif content and content.station:
-                station = content.station.name
+                station_name = "Моя Волна"
+            elif station:
+                station_name = station.name
             else:
                 logging.warning(f"[VOICE] Station {name} not found")
                 await self.respond(ctx, "error", "Станция не найдена.", delete_after=15, ephemeral=True)
                 return
 
-            response_message = f"{member.mention} хочет запустить станцию **{station}**.\n\n Выполнить действие?"
+            response_message = f"{member.mention} хочет запустить станцию **{station_name}**.\n\n Выполнить действие?"
             message = cast(discord.WebhookMessage, await self.respond(ctx, "info", response_message, delete_after=60))
 
             await message.add_reaction('✅')
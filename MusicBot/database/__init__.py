@@ -2,7 +2,7 @@ from .base import BaseGuildsDatabase, BaseUsersDatabase, guilds, users
 from .extensions import VoiceGuildsDatabase
 
 from .user import User, ExplicitUser
-from .guild import Guild, ExplicitGuild, MessageVotes
+from .guild import Guild, ExplicitGuild, MessageVotes, ContentReference
 
 __all__ = [
     'BaseGuildsDatabase',
@@ -13,6 +13,7 @@ __all__ = [
     'Guild',
     'ExplicitGuild',
     'MessageVotes',
+    'ContentReference',
     'guilds',
     'users',
 ]
\ No newline at end of file
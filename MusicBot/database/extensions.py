@@ -1,5 +1,5 @@
 from random import randint
-from typing import Any, Literal
+from typing import Any, Literal, cast
 from yandex_music import Track
 from pymongo import UpdateOne, ReturnDocument
 from pymongo.errors import DuplicateKeyError
@@ -208,10 +208,37 @@ class VoiceGuildsDatabase(BaseGuildsDatabase):
         return True
 
     async def get_track_count(self, gid: int, list_type: Literal['next', 'previous']) -> int:
-        """Get the count of tracks in the specified list."""
+        """Get the count of tracks in the specified list. The list itself is not loaded."""
         field = f"{list_type}_tracks"
-        guild = await self.get_guild(gid, projection={field: 1})
-        return len(guild.get(field, []))
+        guild = await guilds.find_one(
+            {'_id': gid},
+            projection={'_id': 0, 'count': {'$size': {'$ifNull': [f'${field}', []]}}}
+        )
+        return cast(dict[str, int], guild)['count'] if guild else 0
+
+    async def get_tracks_page(
+        self,
+        gid: int,
+        list_type: Literal['next', 'previous'],
+        offset: int,
+        limit: int
+    ) -> tuple[list[dict[str, Any]], int]:
+        """Get a page of the specified list and the count of tracks in it. Only the page is loaded."""
+        field = f"{list_type}_tracks"
+        guild = await guilds.find_one(
+            {'_id': gid},
+            projection={
+                '_id': 0,
+                'tracks': {'$slice': [{'$ifNull': [f'${field}', []]}, offset, limit]},
+                'count': {'$size': {'$ifNull': [f'${field}', []]}}
+            }
+        )
+
+        if not guild:
+            return [], 0
+
+        result = cast(dict[str, Any], guild)
+        return result['tracks'], result['count']
 
     async def set_current_menu(self, gid: int, menu_id: int | None) -> None:
         """Set the current menu message ID."""
@@ -1,5 +1,13 @@
 from typing import TypedDict, Literal, Any
 
+class ContentReference(TypedDict):
+    type: Literal['track', 'album', 'artist', 'playlist', 'user']  # 'user' is the likes playlist
+    id: int | str  # Playlist kind for playlists
+    revision: int | None  # Playlist revision at the time of the reference
+    owner_uid: int | None  # Playlist owner
+    track_ids: list[str]  # Liked track ids, only for 'user'
+    requester_id: int | None  # Discord id of the user whose client resolves the content
+
 class MessageVotes(TypedDict):
     positive_votes: list[int]
     negative_votes: list[int]
@@ -8,7 +16,7 @@ class MessageVotes(TypedDict):
         'next', 'play/pause', 'stop', 'repeat', 'shuffle', 'previous', 'add_track',
         'add_album', 'add_artist', 'add_playlist', 'vibe_station', 'clear_queue'
     ]
-    vote_content: Any | None
+    vote_content: Any | None  # ContentReference for 'add_*' actions
 
 class Guild(TypedDict, total=False):  # Don't forget to change base.py if you add a new field
     next_tracks: list[dict[str, Any]]
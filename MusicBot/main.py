@@ -20,6 +20,19 @@ async def on_ready():
     logging.info("Bot's ready!")
     await bot.change_presence(activity=discord.Activity(type=discord.ActivityType.listening, name="/voice vibe"))
 
+    from MusicBot.ui import MenuView
+    if not any(isinstance(view, MenuView) for view in bot.persistent_views):
+        # Handles menu buttons of all guilds, including menus sent before restart
+        bot.add_view(MenuView.persistent())
+
+    if os.getenv('DEBUG') == 'True' and not log_metrics.is_running():
+        log_metrics.start()
+
+@tasks.loop(seconds=600)
+async def log_metrics():
+    from MusicBot.cogs.utils.metrics import metrics
+    logging.debug(f"[METRICS] {metrics.snapshot()}")
+
 @tasks.loop(seconds=3600)
 async def update_server_count():
     # Don't update server count in debug mode
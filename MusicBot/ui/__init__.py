@@ -1,10 +1,14 @@
-from .other import QueueView, generate_queue_embed
+from .other import QueueView, QUEUE_PAGE_SIZE, LyricsView, generate_queue_embed, generate_lyrics_embed, paginate_lyrics
 from .menu import MenuView
 from .find import ListenView
 
 __all__ = [
     'QueueView',
+    'QUEUE_PAGE_SIZE',
+    'LyricsView',
     'MenuView',
     'ListenView',
-    'generate_queue_embed'
+    'generate_queue_embed',
+    'generate_lyrics_embed',
+    'paginate_lyrics'
 ]
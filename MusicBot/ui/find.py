@@ -1,105 +1,150 @@
 import logging
-from typing import cast
+from dataclasses import dataclass
+from typing import Literal, Self, cast
 
 import discord
-from yandex_music import Track, Album, Artist, Playlist
+from yandex_music import Track, Album, Artist, Playlist, ClientAsync as YMClient
 
 from discord.ui import View, Button, Item
 from discord import ButtonStyle, Interaction
 
-from MusicBot.cogs.utils.voice_extension import VoiceExtension
+from MusicBot.database import ContentReference
+from MusicBot.cogs.utils.services import services
+
+FETCH_ERRORS: dict[str, str] = {
+    'track': "Не удалось получить трек.",
+    'album': "Не удалось получить треки альбома.",
+    'artist': "Не удалось получить треки артиста.",
+    'playlist': "Не удалось получить треки из плейлиста.",
+    'user': "Не удалось получить треки."
+}
+
+@dataclass(slots=True)
+class ListenItem:
+    """Reference to the content of the message. Content is fetched when a button is clicked."""
+    type: Literal['track', 'album', 'artist', 'playlist', 'user']  # 'user' is the likes playlist
+    id: int | str  # Playlist kind for playlists
+    title: str
+    vibe_id: int | str
+    owner_uid: int | None = None  # Playlist owner
+    revision: int | None = None  # Playlist revision
+    track_ids: tuple[str, ...] = ()  # Liked track ids
+    requester_id: int | None = None  # Discord id of the user who requested the content
+
+    @classmethod
+    def from_item(cls, item: Track | Album | Artist | Playlist | list[str], requester_id: int | None = None) -> Self:
+        if isinstance(item, Track):
+            return cls('track', item.id, item.title or '', item.id, requester_id=requester_id)
+        elif isinstance(item, Album):
+            return cls('album', cast(int, item.id), item.title or '', cast(int, item.id), requester_id=requester_id)
+        elif isinstance(item, Artist):
+            return cls('artist', cast(int | str, item.id), item.name or '', cast(int | str, item.id), requester_id=requester_id)
+        elif isinstance(item, Playlist):
+            vibe_id = f"{item.owner.login}_{item.kind}" if item.owner else ''
+            return cls(
+                'playlist', cast(int, item.kind), item.title or '', vibe_id,
+                owner_uid=item.owner.uid if item.owner else None, revision=item.revision, requester_id=requester_id
+            )
+        elif isinstance(item, list):
+            return cls('user', 'onyourwave', 'Мне нравится', 'onyourwave', track_ids=tuple(item), requester_id=requester_id)
+
+        raise ValueError(f"Unknown item type: '{type(item).__name__}'")
+
+    def reference(self) -> ContentReference:
+        """Reference to store in the database instead of the content itself."""
+        return {
+            'type': self.type,
+            'id': self.id,
+            'revision': self.revision,
+            'owner_uid': self.owner_uid,
+            'track_ids': list(self.track_ids),
+            'requester_id': self.requester_id
+        }
 
-class PlayButton(Button, VoiceExtension):
-    def __init__(self, item: Track | Album | Artist | Playlist | list[Track], **kwargs):
+    async def get_client(self, interaction: Interaction) -> YMClient | None:
+        """Get client of the requester, who could see the content. Fall back to the client of the user who clicked
+        if the requester's token is gone. Respond to the interaction on failure."""
+        if self.requester_id and (client := await services.voice.get_user_ym_client(self.requester_id)):
+            return client
+
+        return await services.voice.init_ym_client(interaction)
+
+    async def fetch_tracks(self, client: YMClient) -> list[Track] | None:
+        """Fetch tracks of the content. Return None if they can't be fetched."""
+        return await services.voice.fetch_content_tracks(client, self.reference())
+
+class PlayButton(Button):
+    def __init__(self, item: ListenItem, **kwargs):
         Button.__init__(self, **kwargs)
-        VoiceExtension.__init__(self, None)
         self.item = item
 
     async def callback(self, interaction: Interaction) -> None:
-        logging.debug(f"[FIND] Callback triggered for type: '{type(self.item).__name__}'")
+        logging.debug(f"[FIND] Callback triggered for type: '{self.item.type}'")
 
         if not interaction.guild_id:
             logging.info("[FIND] No guild found in PlayButton callback")
-            await self.respond(interaction, "error", "Эта команда доступна только на серверах.", ephemeral=True, delete_after=15)
+            await services.voice.respond(interaction, "error", "Эта команда доступна только на серверах.", ephemeral=True, delete_after=15)
             return
         
-        if not await self.voice_check(interaction):
+        if not await services.voice.voice_check(interaction):
             return
 
-        guild = await self.db.get_guild(interaction.guild_id, projection={'current_track': 1, 'current_menu': 1, 'vote_add': 1, 'vibing': 1})
+        guild = await services.db.get_guild(interaction.guild_id, projection={'current_track': 1, 'current_menu': 1, 'vote_add': 1, 'vibing': 1})
         if guild['vibing']:
-            await self.respond(interaction, "error", "Нельзя добавлять треки в очередь, пока запущена волна.", ephemeral=True, delete_after=15)
+            await services.voice.respond(interaction, "error", "Нельзя добавлять треки в очередь, пока запущена волна.", ephemeral=True, delete_after=15)
             return
 
         channel = cast(discord.VoiceChannel, interaction.channel)
         member = cast(discord.Member, interaction.user)
 
-        if isinstance(self.item, Track):
-            tracks = [self.item]
+        if self.item.type == 'track':
             action = 'add_track'
             vote_message = f"{member.mention} хочет добавить трек **{self.item.title}** в очередь.\n\n Голосуйте за добавление."
             response_message = f"Трек **{self.item.title}** был добавлен в очередь."
 
-        elif isinstance(self.item, Album):
-            album = await self.item.with_tracks_async()
-            if not album or not album.volumes:
-                logging.debug("[FIND] Failed to fetch album tracks in PlayButton callback")
-                await self.respond(interaction, "error", "Не удалось получить треки альбома.", ephemeral=True, delete_after=15)
-                return
-
-            tracks = [track for volume in album.volumes for track in volume]
+        elif self.item.type == 'album':
             action = 'add_album'
             vote_message = f"{member.mention} хочет добавить альбом **{self.item.title}** в очередь.\n\n Голосуйте за добавление."
             response_message = f"Альбом **{self.item.title}** был добавлен в очередь."
 
-        elif isinstance(self.item, Artist):
-            artist_tracks = await self.item.get_tracks_async()
-            if not artist_tracks:
-                logging.debug("[FIND] Failed to fetch artist tracks in PlayButton callback")
-                await self.respond(interaction, "error", "Не удалось получить треки артиста.", ephemeral=True, delete_after=15)
-                return
-
-            tracks = artist_tracks.tracks.copy()
+        elif self.item.type == 'artist':
             action = 'add_artist'
-            vote_message = f"{member.mention} хочет добавить треки от **{self.item.name}** в очередь.\n\n Голосуйте за добавление."
-            response_message = f"Песни артиста **{self.item.name}** были добавлены в очередь."
-
-        elif isinstance(self.item, Playlist):
-            short_tracks = await self.item.fetch_tracks_async()
-            if not short_tracks:
-                logging.debug("[FIND] Failed to fetch playlist tracks in PlayButton callback")
-                await self.respond(interaction, "error", "Не удалось получить треки из плейлиста.", ephemeral=True, delete_after=15)
-                return
+            vote_message = f"{member.mention} хочет добавить треки от **{self.item.title}** в очередь.\n\n Голосуйте за добавление."
+            response_message = f"Песни артиста **{self.item.title}** были добавлены в очередь."
 
-            tracks = [cast(Track, short_track.track) for short_track in short_tracks]
+        elif self.item.type == 'playlist':
             action = 'add_playlist'
             vote_message = f"{member.mention} хочет добавить плейлист **{self.item.title}** в очередь.\n\n Голосуйте за добавление."
             response_message = f"Плейлист **{self.item.title}** был добавлен в очередь."
 
-        elif isinstance(self.item, list):
-            tracks = self.item.copy()
-            if not tracks:
-                logging.debug("[FIND] Empty tracks list in PlayButton callback")
-                await self.respond(interaction, "error", "Не удалось получить треки.", ephemeral=True, delete_after=15)
-                return
-
+        else:
             action = 'add_playlist'
             vote_message = f"{member.mention} хочет добавить плейлист **Мне Нравится** в очередь.\n\n Голосуйте за добавление."
             response_message = f"Плейлист **«Мне нравится»** был добавлен в очередь."
 
-        else:
-            raise ValueError(f"Unknown item type: '{type(self.item).__name__}'")
+        if not (client := await self.item.get_client(interaction)):
+            return
+
+        # Content is checked before the vote, tracks are fetched again with the requester's client when it passes
+        if not (tracks := await self.item.fetch_tracks(client)):
+            logging.debug(f"[FIND] Failed to fetch '{self.item.type}' tracks in PlayButton callback")
+            await services.voice.respond(interaction, "error", FETCH_ERRORS[self.item.type], ephemeral=True, delete_after=15)
+            return
 
         if guild['vote_add'] and len(channel.members) > 2 and not member.guild_permissions.manage_channels:
             logging.info(f"Starting vote for '{action}' (from PlayButton callback)")
 
-            message = cast(discord.Interaction, await self.respond(interaction, "info", vote_message, delete_after=60))
+            message = cast(discord.Interaction, await services.voice.respond(interaction, "info", vote_message, delete_after=60))
             response = await message.original_response()
 
             await response.add_reaction('✅')
             await response.add_reaction('❌')
 
-            await self.db.update_vote(
+            # Tracks are fetched when the vote passes
+            content = self.item.reference()
+            content['requester_id'] = content['requester_id'] or interaction.user.id
+
+            await services.db.update_vote(
                 interaction.guild_id,
                 response.id,
                 {
@@ -107,67 +152,55 @@ class PlayButton(Button, VoiceExtension):
                     'negative_votes': list(),
                     'total_members': len(channel.members),
                     'action': action,
-                    'vote_content': [track.to_dict() for track in tracks]
+                    'vote_content': content
                 }
             )
             return
 
         if guild['current_menu']:
-            await self.respond(interaction, "success", response_message, delete_after=15)
-        elif not await self.send_menu_message(interaction, disable=True):
-            await self.respond(interaction, "error", "Не удалось отправить сообщение.", ephemeral=True, delete_after=15)
+            await services.voice.respond(interaction, "success", response_message, delete_after=15)
+        elif not await services.voice.send_menu_message(interaction, disable=True):
+            await services.voice.respond(interaction, "error", "Не удалось отправить сообщение.", ephemeral=True, delete_after=15)
 
         if guild['current_track']:
             logging.debug(f"[FIND] Adding tracks to queue")
-            await self.db.modify_track(interaction.guild_id, tracks, 'next', 'extend')
+            await services.db.modify_track(interaction.guild_id, tracks, 'next', 'extend')
         else:
             logging.debug(f"[FIND] Playing track")
             track = tracks.pop(0)
-            await self.db.modify_track(interaction.guild_id, tracks, 'next', 'extend')
-            if not await self.play_track(interaction, track):
-                await self.respond(interaction, "error", "Не удалось воспроизвести трек.", ephemeral=True, delete_after=15)
+            await services.db.modify_track(interaction.guild_id, tracks, 'next', 'extend')
+            if not await services.voice.play_track(interaction, track):
+                await services.voice.respond(interaction, "error", "Не удалось воспроизвести трек.", ephemeral=True, delete_after=15)
 
         if interaction.message:
             await interaction.message.delete()
         else:
             logging.warning(f"[FIND] Interaction message is None")
 
-class MyVibeButton(Button, VoiceExtension):
-    def __init__(self, item: Track | Album | Artist | Playlist | list[Track], *args, **kwargs):
+class MyVibeButton(Button):
+    def __init__(self, item: ListenItem, *args, **kwargs):
         Button.__init__(self, *args, **kwargs)
-        VoiceExtension.__init__(self, None)
         self.item = item
     
     async def callback(self, interaction: discord.Interaction):
-        logging.debug(f"[VIBE] Button callback for '{type(self.item).__name__}'")
+        logging.debug(f"[VIBE] Button callback for '{self.item.type}'")
 
-        if not await self.voice_check(interaction):
+        if not await services.voice.voice_check(interaction):
             return
 
         if not interaction.guild_id or not interaction.user:
             logging.warning(f"[VIBE] Guild ID or user is None in button callback")
             return
 
-        guild = await self.db.get_guild(interaction.guild_id, projection={'current_menu': 1, 'vibing': 1})
+        guild = await services.db.get_guild(interaction.guild_id, projection={'current_menu': 1, 'vibing': 1})
         if guild['vibing']:
-            await self.respond(interaction, "error", "Волна уже запущена. Остановите её с помощью команды /voice stop.", ephemeral=True, delete_after=15)
+            await services.voice.respond(interaction, "error", "Волна уже запущена. Остановите её с помощью команды /voice stop.", ephemeral=True, delete_after=15)
             return
 
-        track_type_map = {
-            Track: 'track', Album: 'album', Artist: 'artist', Playlist: 'playlist', list: 'user'
-        }
-
-        if isinstance(self.item, Playlist):
-            if not self.item.owner:
-                logging.warning(f"[VIBE] Playlist owner is None")
-                await self.respond(interaction, "error", "Не удалось получить информацию о плейлисте. Отсутствует владелец.", ephemeral=True, delete_after=15)
-                return
-
-            _id = self.item.owner.login + '_' + str(self.item.kind)
-        elif not isinstance(self.item, list):
-            _id = cast(int | str, self.item.id)
-        else:
-            _id = 'onyourwave'
+        if not self.item.vibe_id:
+            logging.warning(f"[VIBE] Playlist owner is None")
+            await services.voice.respond(interaction, "error", "Не удалось получить информацию о плейлисте. Отсутствует владелец.", ephemeral=True, delete_after=15)
+            return
 
         member = cast(discord.Member, interaction.user)
         channel = cast(discord.VoiceChannel, interaction.channel)
@@ -175,25 +208,25 @@ class MyVibeButton(Button, VoiceExtension):
         if len(channel.members) > 2 and not member.guild_permissions.manage_channels:
             logging.info(f"Starting vote for starting vibe in guild {interaction.guild_id}")
 
-            match self.item:
-                case Track():
-                    response_message = f"{member.mention} хочет запустить волну по треку **{self.item['title']}**.\n\n Выполнить действие?"
-                case Album():
-                    response_message = f"{member.mention} хочет запустить волну по альбому **{self.item['title']}**.\n\n Выполнить действие?"
-                case Artist():
-                    response_message = f"{member.mention} хочет запустить волну по исполнителю **{self.item['name']}**.\n\n Выполнить действие?"
-                case Playlist():
-                    response_message = f"{member.mention} хочет запустить волну по плейлисту **{self.item['title']}**.\n\n Выполнить действие?"
-                case list():
+            match self.item.type:
+                case 'track':
+                    response_message = f"{member.mention} хочет запустить волну по треку **{self.item.title}**.\n\n Выполнить действие?"
+                case 'album':
+                    response_message = f"{member.mention} хочет запустить волну по альбому **{self.item.title}**.\n\n Выполнить действие?"
+                case 'artist':
+                    response_message = f"{member.mention} хочет запустить волну по исполнителю **{self.item.title}**.\n\n Выполнить действие?"
+                case 'playlist':
+                    response_message = f"{member.mention} хочет запустить волну по плейлисту **{self.item.title}**.\n\n Выполнить действие?"
+                case 'user':
                     response_message = f"{member.mention} хочет запустить станцию **Моя Волна**.\n\n Выполнить действие?"
 
-            message = cast(discord.Interaction, await self.respond(interaction, "info", response_message))
+            message = cast(discord.Interaction, await services.voice.respond(interaction, "info", response_message))
             response = await message.original_response()
 
             await response.add_reaction('✅')
             await response.add_reaction('❌')
             
-            await self.db.update_vote(
+            await services.db.update_vote(
                 interaction.guild_id,
                 response.id,
                 {
@@ -201,23 +234,34 @@ class MyVibeButton(Button, VoiceExtension):
                     'negative_votes': list(),
                     'total_members': len(channel.members),
                     'action': 'vibe_station',
-                    'vote_content': [track_type_map[type(self.item)], _id, interaction.user.id]
+                    'vote_content': [self.item.type, self.item.vibe_id, interaction.user.id]
                 }
             )
             return
 
-        if not guild['current_menu'] and not await self.send_menu_message(interaction, disable=True):
-            await self.respond(interaction, "error", "Не удалось отправить сообщение.", ephemeral=True, delete_after=15)
+        if not guild['current_menu'] and not await services.voice.send_menu_message(interaction, disable=True):
+            await services.voice.respond(interaction, "error", "Не удалось отправить сообщение.", ephemeral=True, delete_after=15)
 
-        await self.update_vibe(interaction, track_type_map[type(self.item)], _id)
+        await services.voice.update_vibe(interaction, self.item.type, self.item.vibe_id)
 
-        if (next_track := await self.db.get_track(interaction.guild_id, 'next')):
-            await self.play_track(interaction, next_track)
+        if (next_track := await services.db.get_track(interaction.guild_id, 'next')):
+            await services.voice.play_track(interaction, next_track)
 
 class ListenView(View):
-    def __init__(self, item: Track | Album | Artist | Playlist | list[Track], *items: Item, timeout: float | None = 360, disable_on_timeout: bool = True):
+    """Buttons to listen to the content. Only a `ListenItem` reference is kept, `list[str]` are ids of liked tracks.
+    Content is fetched with the client of `requester_id`, the user who requested it."""
+
+    def __init__(
+        self,
+        item: Track | Album | Artist | Playlist | list[str],
+        *items: Item,
+        requester_id: int | None = None,
+        timeout: float | None = 360,
+        disable_on_timeout: bool = True
+    ):
         super().__init__(*items, timeout=timeout, disable_on_timeout=disable_on_timeout)
         logging.debug(f"[FIND] Creating view for type: '{type(item).__name__}'")
+        listen_item = ListenItem.from_item(item, requester_id)
 
         if isinstance(item, Track):
             link_app = f"yandexmusic://album/{item.albums[0].id}/track/{item.id}"
@@ -232,14 +276,14 @@ class ListenView(View):
             link_app = f"yandexmusic://playlists/{item.playlist_uuid}"
             link_web = f"https://music.yandex.ru/playlists/{item.playlist_uuid}"
         elif isinstance(item, list):  # Can't open other person's likes
-            self.add_item(PlayButton(item, label="Слушать в голосовом канале", style=ButtonStyle.gray))
-            self.add_item(MyVibeButton(item, label="Моя Волна", style=ButtonStyle.gray, emoji="🌊", row=1))
+            self.add_item(PlayButton(listen_item, label="Слушать в голосовом канале", style=ButtonStyle.gray))
+            self.add_item(MyVibeButton(listen_item, label="Моя Волна", style=ButtonStyle.gray, emoji="🌊", row=1))
             return
 
         self.button1: Button = Button(label="Слушать в приложении", style=ButtonStyle.gray, url=link_app, row=0)
         self.button2: Button = Button(label="Слушать в браузере", style=ButtonStyle.gray, url=link_web, row=0)
-        self.button3: PlayButton = PlayButton(item, label="Слушать в голосовом канале", style=ButtonStyle.gray, row=0)
-        self.button4: MyVibeButton = MyVibeButton(item, label="Моя Волна", style=ButtonStyle.gray, emoji="🌊", row=1)
+        self.button3: PlayButton = PlayButton(listen_item, label="Слушать в голосовом канале", style=ButtonStyle.gray, row=0)
+        self.button4: MyVibeButton = MyVibeButton(listen_item, label="Моя Волна", style=ButtonStyle.gray, emoji="🌊", row=1)
 
         if item.available:
             # self.add_item(self.button1)  # Discord doesn't allow well formed URLs in buttons for some reason.
@@ -1,24 +1,24 @@
+import asyncio
 import logging
-from time import monotonic
-from typing import Self, Literal, cast
+from typing import Any, Final, Self, Literal, cast
 
 from discord.ui import View, Button, Item, Select
 from discord import (
     Interaction, ApplicationContext, RawReactionActionEvent,
-    VoiceChannel, ButtonStyle, Embed, ComponentType, SelectOption, Member, HTTPException
+    VoiceChannel, ButtonStyle, ComponentType, SelectOption, Member, HTTPException
 )
 
 import yandex_music.exceptions
 from yandex_music import TrackLyrics, Playlist, ClientAsync as YMClient
 
-from MusicBot.cogs.utils import VoiceExtension
+from MusicBot.cogs.utils.services import services
+from MusicBot.cogs.utils.scheduler import Priority, ym_priority
+from MusicBot.cogs.utils.playlists import CachedPlaylist
+from MusicBot.ui.other import LyricsView, generate_lyrics_embed, paginate_lyrics
 
-class ToggleButton(Button, VoiceExtension):
-    def __init__(self, root: 'MenuView', *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        VoiceExtension.__init__(self, None)
-        self.root = root
-    
+MENU_UPDATE_TIMEOUT: Final[float] = 2  # Seconds to wait for likes and dislikes before rendering default styles.
+
+class ToggleButton(Button):
     async def callback(self, interaction: Interaction) -> None:
 
         if (callback_type := interaction.custom_id) not in ('repeat', 'shuffle'):
@@ -28,13 +28,13 @@ class ToggleButton(Button, VoiceExtension):
         
         if not (gid := interaction.guild_id) or not interaction.user:
             logging.warning('[MENU] Failed to get guild ID.')
-            await self.respond(interaction, "error", "Что-то пошло не так. Попробуйте снова.", delete_after=15, ephemeral=True)
+            await services.voice.respond(interaction, "error", "Что-то пошло не так. Попробуйте снова.", delete_after=15, ephemeral=True)
             return
         
-        if not await self.voice_check(interaction):
+        if not await services.voice.voice_check(interaction):
             return
 
-        guild = await self.db.get_guild(gid)
+        guild = await services.db.get_guild(gid)
         member = cast(Member, interaction.user)
         channel = cast(VoiceChannel, interaction.channel)
 
@@ -43,13 +43,13 @@ class ToggleButton(Button, VoiceExtension):
             
             action = "выключить" if guild[callback_type] else "включить"
             task = "перемешивание треков" if callback_type == 'shuffle' else "повтор трека"
-            message = cast(Interaction, await self.respond(interaction, "info", f"{member.mention} хочет {action} {task}.\n\nВыполнить действие?", delete_after=60))
+            message = cast(Interaction, await services.voice.respond(interaction, "info", f"{member.mention} хочет {action} {task}.\n\nВыполнить действие?", delete_after=60))
             response = await message.original_response()
 
             await response.add_reaction('✅')
             await response.add_reaction('❌')
 
-            await self.db.update_vote(
+            await services.db.update_vote(
                 gid,
                 response.id,
                 {
@@ -62,29 +62,21 @@ class ToggleButton(Button, VoiceExtension):
             )
             return
         
-        await self.db.update(gid, {callback_type: not guild[callback_type]})
-
-        button = self.root.repeat_button if callback_type == 'repeat' else self.root.shuffle_button
-        button.style = ButtonStyle.secondary if guild[callback_type] else ButtonStyle.success
+        await services.db.update(gid, {callback_type: not guild[callback_type]})
+        await services.voice.edit_menu_from_interaction(interaction, view=await services.voice.build_menu_view(interaction))
 
-        await interaction.edit(view=await self.root.update())
-
-class PlayPauseButton(Button, VoiceExtension):
-    def __init__(self, **kwargs):
-        Button.__init__(self, **kwargs)
-        VoiceExtension.__init__(self, None)
-    
+class PlayPauseButton(Button):
     async def callback(self, interaction: Interaction) -> None:
         logging.info('[MENU] Play/Pause button callback...')
 
-        if not await self.voice_check(interaction):
+        if not await services.voice.voice_check(interaction):
             return
 
         if not (gid := interaction.guild_id) or not interaction.user:
             logging.warning('[MENU] Failed to get guild ID or user.')
             return
         
-        if not (vc := await self.get_voice_client(interaction)) or not interaction.message:
+        if not (vc := await services.voice.get_voice_client(interaction)) or not interaction.message:
             return
 
         member = cast(Member, interaction.user)
@@ -94,13 +86,13 @@ class PlayPauseButton(Button, VoiceExtension):
             logging.info(f"[MENU] User {interaction.user.id} started vote to pause/resume track in guild {gid}")
             
             task = "приостановить" if vc.is_playing() else "возобновить"
-            message = cast(Interaction, await self.respond(interaction, "info", f"{member.mention} хочет {task} проигрывание.\n\nВыполнить действие?", delete_after=60))
+            message = cast(Interaction, await services.voice.respond(interaction, "info", f"{member.mention} хочет {task} проигрывание.\n\nВыполнить действие?", delete_after=60))
             response = await message.original_response()
 
             await response.add_reaction('✅')
             await response.add_reaction('❌')
 
-            await self.db.update_vote(
+            await services.db.update_vote(
                 gid,
                 response.id,
                 {
@@ -121,13 +113,13 @@ class PlayPauseButton(Button, VoiceExtension):
         try:
             embed = interaction.message.embeds[0]
         except IndexError:
-            await self.respond(interaction, "error", "Нет воспроизводимого трека.", delete_after=15, ephemeral=True)
+            await services.voice.respond(interaction, "error", "Нет воспроизводимого трека.", delete_after=15, ephemeral=True)
             return
 
-        guild = await self.db.get_guild(interaction.guild_id, projection={'single_token_uid': 1})
+        guild = await services.db.get_guild(interaction.guild_id, projection={'single_token_uid': 1})
     
         if not vc.is_paused() and guild['single_token_uid']:
-            user = await self.get_discord_user_by_id(interaction, guild['single_token_uid'])
+            user = await services.voice.get_discord_user_by_id(interaction, guild['single_token_uid'])
 
             if guild['single_token_uid'] and user:
                 embed.set_footer(text=f"Используется токен {user.display_name}", icon_url=user.display_avatar.url)
@@ -139,13 +131,9 @@ class PlayPauseButton(Button, VoiceExtension):
         else:
             embed.remove_footer()
 
-        await interaction.edit(embed=embed)
+        await services.voice.edit_menu_from_interaction(interaction, embed=embed)
 
-class SwitchTrackButton(Button, VoiceExtension):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        VoiceExtension.__init__(self, None)
-    
+class SwitchTrackButton(Button):
     async def callback(self, interaction: Interaction) -> None:
 
         if (callback_type := interaction.custom_id) not in ('next', 'previous'):
@@ -157,15 +145,15 @@ class SwitchTrackButton(Button, VoiceExtension):
 
         logging.info(f'[MENU] {callback_type.capitalize()} track button callback')
 
-        if not await self.voice_check(interaction):
+        if not await services.voice.voice_check(interaction):
             return
 
         tracks_type = callback_type + '_tracks'
-        guild = await self.db.get_guild(gid, projection={tracks_type: 1, 'vote_switch_track': 1, 'vibing': 1})
+        guild = await services.db.get_guild(gid, projection={tracks_type: 1, 'vote_switch_track': 1, 'vibing': 1})
 
         if not guild[tracks_type] and not guild['vibing']:
             logging.info(f"[MENU] No tracks in '{tracks_type}' list in guild {gid}")
-            await self.respond(interaction, "error", f"Нет треков в {'очереди' if callback_type == 'next' else 'истории'}.", delete_after=15, ephemeral=True)
+            await services.voice.respond(interaction, "error", f"Нет треков в {'очереди' if callback_type == 'next' else 'истории'}.", delete_after=15, ephemeral=True)
             return
 
         member = cast(Member, interaction.user)
@@ -175,13 +163,13 @@ class SwitchTrackButton(Button, VoiceExtension):
             logging.info(f"[MENU] User {interaction.user.id} started vote to skip track in guild {gid}")
 
             task = "пропустить текущий трек" if callback_type == 'next' else "вернуться к предыдущему треку"
-            message = cast(Interaction, await self.respond(interaction, "info", f"{member.mention} хочет {task}.\n\nВыполнить переход?", delete_after=60))
+            message = cast(Interaction, await services.voice.respond(interaction, "info", f"{member.mention} хочет {task}.\n\nВыполнить переход?", delete_after=60))
             response = await message.original_response()
 
             await response.add_reaction('✅')
             await response.add_reaction('❌')
 
-            await self.db.update_vote(
+            await services.db.update_vote(
                 gid,
                 response.id,
                 {
@@ -195,19 +183,14 @@ class SwitchTrackButton(Button, VoiceExtension):
             return
 
         if callback_type == 'next':
-            title = await self.play_next_track(interaction, button_callback=True)
+            title = await services.voice.play_next_track(interaction, button_callback=True)
         else:
-            title = await self.play_previous_track(interaction, button_callback=True)
+            title = await services.voice.play_previous_track(interaction, button_callback=True)
 
         if not title:
-            await self.respond(interaction, "error", "Что-то пошло не так. Попробуйте позже.", delete_after=15, ephemeral=True)
+            await services.voice.respond(interaction, "error", "Что-то пошло не так. Попробуйте позже.", delete_after=15, ephemeral=True)
 
-class ReactionButton(Button, VoiceExtension):
-    def __init__(self, root: 'MenuView', *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        VoiceExtension.__init__(self, None)
-        self.root = root
-    
+class ReactionButton(Button):
     async def callback(self, interaction: Interaction):
         callback_type = interaction.custom_id
         if callback_type not in ('like', 'dislike'):
@@ -215,38 +198,35 @@ class ReactionButton(Button, VoiceExtension):
 
         logging.info(f'[MENU] {callback_type.capitalize()} button callback')
 
-        if not await self.voice_check(interaction) or not (gid := interaction.guild_id):
+        if not await services.voice.voice_check(interaction) or not (gid := interaction.guild_id):
             return
 
-        if not (vc := await self.get_voice_client(interaction)) or not vc.is_playing:
-            await self.respond(interaction, "error", "Нет воспроизводимого трека.", delete_after=15, ephemeral=True)
+        if not (vc := await services.voice.get_voice_client(interaction)) or not vc.is_playing:
+            await services.voice.respond(interaction, "error", "Нет воспроизводимого трека.", delete_after=15, ephemeral=True)
 
         channel = cast(VoiceChannel, interaction.channel)
         res = await self.react_track(interaction, callback_type)
 
         if callback_type == 'like' and res[0]:
-            button = self.root.like_button
             response_message = f"Трек был {'добавлен в понравившиеся.' if res[1] == 'added' else 'удалён из понравившихся.'}"
 
         elif callback_type == 'dislike' and res[0]:
 
             if len(channel.members) == 2:
-                await self.play_next_track(interaction, vc=vc, button_callback=True)
+                await services.voice.play_next_track(interaction, vc=vc, button_callback=True)
                 return
 
-            button = self.root.dislike_button
             response_message =f"Трек был {'добавлен в дизлайки.' if res[1] == 'added' else 'удалён из дизлайков.'}"
 
         else:
             logging.debug(f"[VC_EXT] Failed to get {callback_type} tracks")
-            await self.respond(interaction, "error", "Операция не удалась. Попробуйте позже.", delete_after=15, ephemeral=True)
+            await services.voice.respond(interaction, "error", "Операция не удалась. Попробуйте позже.", delete_after=15, ephemeral=True)
             return
 
         if len(channel.members) == 2:
-            button.style = ButtonStyle.success if res[1] == 'added' else ButtonStyle.secondary
-            await interaction.edit(view=await self.root.update())
+            await services.voice.edit_menu_from_interaction(interaction, view=await services.voice.build_menu_view(interaction))
         else:
-            await self.respond(interaction, "success", response_message, delete_after=15, ephemeral=True)
+            await services.voice.respond(interaction, "success", response_message, delete_after=15, ephemeral=True)
     
     async def react_track(
         self,
@@ -266,81 +246,76 @@ class ReactionButton(Button, VoiceExtension):
             logging.warning("[VC_EXT] Guild or User not found")
             return (False, None)
 
-        if not (current_track := await self.db.get_track(gid, 'current')):
+        if not (current_track := await services.db.get_track(gid, 'current')):
             logging.debug("[VC_EXT] Current track not found")
             return (False, None)
 
-        if not (client := await self.init_ym_client(ctx)):
+        if not (client := await services.voice.init_ym_client(ctx)):
             return (False, None)
 
         if action == 'like':
-            tracks = await client.users_likes_tracks()
             add_func = client.users_likes_tracks_add
             remove_func = client.users_likes_tracks_remove
         else:
-            tracks = await client.users_dislikes_tracks()
             add_func = client.users_dislikes_tracks_add
             remove_func = client.users_dislikes_tracks_remove
 
-        if tracks is None:
+        if (tracks := await services.reactions.get(client, action)) is None:
             logging.debug(f"[VC_EXT] No {action}s found")
             return (False, None)
 
-        if str(current_track['id']) not in [str(track.id) for track in tracks]:
+        if str(current_track['id']) not in tracks:
             logging.debug(f"[VC_EXT] Track not found in {action}s. Adding...")
-            await add_func(current_track['id'])
+            with ym_priority(Priority.FEEDBACK):
+                await add_func(current_track['id'])
+            services.reactions.update(client, action, current_track['id'], added=True)
             return (True, 'added')
         else:
             logging.debug(f"[VC_EXT] Track found in {action}s. Removing...")
-            await remove_func(current_track['id'])
+            with ym_priority(Priority.FEEDBACK):
+                await remove_func(current_track['id'])
+            services.reactions.update(client, action, current_track['id'], added=False)
             return (True, 'removed')
 
-class LyricsButton(Button, VoiceExtension):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        VoiceExtension.__init__(self, None)
-        
+class LyricsButton(Button):
     async def callback(self, interaction: Interaction) -> None:
         logging.info('[MENU] Lyrics button callback...')
 
-        if not await self.voice_check(interaction) or not interaction.guild_id or not interaction.user:
+        if not await services.voice.voice_check(interaction) or not interaction.guild_id or not interaction.user:
             return
         
-        if not (client := await self.init_ym_client(interaction)):
+        if not (client := await services.voice.init_ym_client(interaction)):
             return
 
-        if not (current_track := await self.db.get_track(interaction.guild_id, 'current')):
+        if not (current_track := await services.db.get_track(interaction.guild_id, 'current')):
             logging.debug('[MENU] No current track found')
             return
 
-        try:
-            lyrics = cast(TrackLyrics, await client.tracks_lyrics(current_track['id']))
-        except yandex_music.exceptions.NotFoundError:
+        track_id = str(current_track['id'])
+        if (pages := services.lyrics.get(track_id)) is None:
+            try:
+                pages = await services.flights.do(('lyrics', track_id), lambda: _fetch_lyrics_pages(client, track_id))
+            except yandex_music.exceptions.NotFoundError:
+                pages = []
+            services.lyrics.set(track_id, pages)
+
+        if not pages:
             logging.debug('[MENU] Lyrics not found')
-            await self.respond(interaction, "error", "Текст песни не найден. Яндекс нам соврал (опять)!", delete_after=15, ephemeral=True)
+            await services.voice.respond(interaction, "error", "Текст песни не найден. Яндекс нам соврал (опять)!", delete_after=15, ephemeral=True)
             return
 
-        embed = Embed(
-            title=current_track['title'],
-            description='**Текст песни**',
-            color=0xfed42b,
-        )
-        text = await lyrics.fetch_lyrics_async()
-
-        for subtext in text.split('\n\n'):
-            embed.add_field(name='', value=subtext, inline=False)
+        view = LyricsView(current_track['title'], pages)
+        await interaction.respond(embed=generate_lyrics_embed(view.title, pages, 0), view=view, ephemeral=True)
 
-        await interaction.respond(embed=embed, ephemeral=True)
+async def _fetch_lyrics_pages(client: YMClient, track_id: str) -> list[str]:
+    lyrics = cast(TrackLyrics, await client.tracks_lyrics(track_id))
+    return paginate_lyrics(await lyrics.fetch_lyrics_async())
 
-class MyVibeButton(Button, VoiceExtension):
-    def __init__(self, **kwargs):
-        Button.__init__(self, **kwargs)
-        VoiceExtension.__init__(self, None)
-    
+class MyVibeButton(Button):
     async def callback(self, interaction: Interaction) -> None:
         logging.info('[MENU] My vibe button callback')
 
-        if not await self.voice_check(interaction):
+        if not await services.voice.voice_check(interaction):
             return
 
         if not interaction.guild_id or not interaction.user:
@@ -349,7 +324,7 @@ class MyVibeButton(Button, VoiceExtension):
         
         member = cast(Member, interaction.user)
         channel = cast(VoiceChannel, interaction.channel)
-        track = await self.db.get_track(interaction.guild_id, 'current')
+        track = await services.db.get_track(interaction.guild_id, 'current')
 
         if len(channel.members) > 2 and not member.guild_permissions.manage_channels:
             logging.info(f"Starting vote for starting vibe in guild {interaction.guild_id}")
@@ -363,13 +338,13 @@ class MyVibeButton(Button, VoiceExtension):
                 vibe_type = 'user'
                 vibe_id = 'onyourwave'
 
-            message = cast(Interaction, await self.respond(interaction, "info", response_message))
+            message = cast(Interaction, await services.voice.respond(interaction, "info", response_message))
             response = await message.original_response()
 
             await response.add_reaction('✅')
             await response.add_reaction('❌')
             
-            await self.db.update_vote(
+            await services.db.update_vote(
                 interaction.guild_id,
                 response.id,
                 {
@@ -384,14 +359,14 @@ class MyVibeButton(Button, VoiceExtension):
 
         if track:
             logging.info(f"[MENU] Playing vibe for track '{track["id"]}'")
-            res = await self.update_vibe(
+            res = await services.voice.update_vibe(
                 interaction,
                 'track',
                 track['id']
             )
         else:
             logging.info('[MENU] Playing station user:onyourwave')
-            res = await self.update_vibe(
+            res = await services.voice.update_vibe(
                 interaction,
                 'user',
                 'onyourwave'
@@ -399,20 +374,16 @@ class MyVibeButton(Button, VoiceExtension):
 
         if not res:
             logging.info('[MENU] Failed to start the vibe')
-            await self.respond(interaction, "error", "Не удалось запустить **Мою Волну**. Возможно, у вас нет подписки на Яндекс Музыку.", ephemeral=True)
+            await services.voice.respond(interaction, "error", "Не удалось запустить **Мою Волну**. Возможно, у вас нет подписки на Яндекс Музыку.", ephemeral=True)
 
-        if (next_track := await self.db.get_track(interaction.guild_id, 'next')):
-            await self.play_track(interaction, next_track, button_callback=True)
+        if (next_track := await services.db.get_track(interaction.guild_id, 'next')):
+            await services.voice.play_track(interaction, next_track, button_callback=True)
 
-class MyVibeSelect(Select, VoiceExtension):
-    def __init__(self, *args,  **kwargs):
-        super().__init__(*args, **kwargs)
-        VoiceExtension.__init__(self, None)
-    
+class MyVibeSelect(Select):
     async def callback(self, interaction: Interaction) -> None:
         logging.info('[MENU] My vibe select callback')
 
-        if not await self.voice_check(interaction):
+        if not await services.voice.voice_check(interaction):
             return
 
         if not interaction.user:
@@ -438,20 +409,19 @@ class MyVibeSelect(Select, VoiceExtension):
             return
 
         logging.info(f"[MENU] Settings option '{custom_id}' updated to '{data_values[0]}'")
-        await self.users_db.update(interaction.user.id, {f'vibe_settings.{custom_id}': data_values[0]})
+        await services.users_db.update(interaction.user.id, {f'vibe_settings.{custom_id}': data_values[0]})
         
         view = await MyVibeSettingsView(interaction).init()
         view.disable_all_items()
         await interaction.edit(view=view)
 
-        await self.update_vibe(interaction, 'user', 'onyourwave', update_settings=True)
+        await services.voice.update_vibe(interaction, 'user', 'onyourwave', update_settings=True)
         view.enable_all_items()
         await interaction.edit(view=view)
 
-class MyVibeSettingsView(View, VoiceExtension):
+class MyVibeSettingsView(View):
     def __init__(self, interaction: Interaction, *items: Item, timeout: float | None = 360, disable_on_timeout: bool = True):
         View.__init__(self, *items, timeout=timeout, disable_on_timeout=disable_on_timeout)
-        VoiceExtension.__init__(self, None)
         self.interaction = interaction
 
     async def init(self) -> Self:
@@ -459,7 +429,7 @@ class MyVibeSettingsView(View, VoiceExtension):
             logging.warning('[MENU] No user in settings view')
             return self
 
-        settings = (await self.users_db.get_user(self.interaction.user.id, projection={'vibe_settings'}))['vibe_settings']
+        settings = (await services.users_db.get_user(self.interaction.user.id, projection={'vibe_settings'}))['vibe_settings']
 
         diversity_settings = settings['diversity']
         diversity = [
@@ -519,28 +489,23 @@ class MyVibeSettingsView(View, VoiceExtension):
             pass
         self.stop()
 
-class MyVibeSettingsButton(Button, VoiceExtension):
-    def __init__(self, **kwargs):
-        super().__init__(**kwargs)
-        VoiceExtension.__init__(self, None)
-
+class MyVibeSettingsButton(Button):
     async def callback(self, interaction: Interaction) -> None:
         logging.info('[MENU] My vibe settings button callback')
-        if not await self.voice_check(interaction, check_vibe_privilage=True):
+        if not await services.voice.voice_check(interaction, check_vibe_privilage=True):
             return
 
-        await self.respond(interaction, "info", "Настройки **Волны**", view=await MyVibeSettingsView(interaction).init(), ephemeral=True)
+        await services.voice.respond(interaction, "info", "Настройки **Волны**", view=await MyVibeSettingsView(interaction).init(), ephemeral=True)
 
-class AddToPlaylistSelect(Select, VoiceExtension):
+class AddToPlaylistSelect(Select):
     def __init__(self, ym_client: YMClient, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        VoiceExtension.__init__(self, None)
         self.ym_client = ym_client
         
     async def callback(self, interaction: Interaction):
         logging.info('[MENU] Add to playlist select callback')
 
-        if not await self.voice_check(interaction):
+        if not await services.voice.voice_check(interaction):
             return
 
         if not interaction.guild_id or not interaction.data or 'values' not in interaction.data:
@@ -554,63 +519,79 @@ class AddToPlaylistSelect(Select, VoiceExtension):
             logging.warning('[MENU] No data in select callback')
             return
 
-        kind, user_id = data_values[0].split(';')
-        playlist = cast(Playlist, await self.ym_client.users_playlists(kind=kind, user_id=user_id))
-        current_track = await self.db.get_track(interaction.guild_id, 'current')
+        kind = int(data_values[0].split(';')[0])
+        current_track = await services.db.get_track(interaction.guild_id, 'current')
 
         if not current_track:
             return
 
-        tracks = [track.id for track in playlist.tracks]
-        track_in_playlist = current_track['id'] in tracks
-        
-        if track_in_playlist:
-            index = tracks.index(current_track['id'])
-            res = await self.ym_client.users_playlists_delete_track(
-                kind=f"{playlist.kind}",
-                from_=index,
-                to=index + 1,
-                revision=playlist.revision or 1
-            )
-        else:
-            res = await self.ym_client.users_playlists_insert_track(
-                kind=f"{playlist.kind}",
-                track_id=current_track['id'],
-                album_id=current_track['albums'][0]['id'],
-                revision=playlist.revision or 1
-            )
+        res, track_in_playlist = None, False
+        for attempt in range(2):
+            try:
+                if not (playlist := await services.playlists.get(self.ym_client, kind)) or playlist.track_ids is None:
+                    break
+
+                track_in_playlist = current_track['id'] in playlist
+                res = await self._toggle_track(playlist, current_track, track_in_playlist)
+                break
+            except yandex_music.exceptions.YandexMusicError as e:
+                # Cached revision may be outdated if the playlist was changed elsewhere
+                logging.info(f"[MENU] Failed to modify playlist {kind} (attempt {attempt + 1}): {e}")
+                services.playlists.invalidate(self.ym_client, kind)
 
         if not res:
-            await self.respond(interaction, "error", "Что-то пошло не так. Попробуйте позже.", delete_after=15, ephemeral=True)
+            await services.voice.respond(interaction, "error", "Что-то пошло не так. Попробуйте позже.", delete_after=15, ephemeral=True)
         elif track_in_playlist:
-            await self.respond(interaction, "success", "🗑 Трек был удалён из плейлиста.", delete_after=15, ephemeral=True)
+            await services.voice.respond(interaction, "success", "🗑 Трек был удалён из плейлиста.", delete_after=15, ephemeral=True)
         else:
-            await self.respond(interaction, "success", "📩 Трек был добавлен в плейлист.", delete_after=15, ephemeral=True)
-            
+            await services.voice.respond(interaction, "success", "📩 Трек был добавлен в плейлист.", delete_after=15, ephemeral=True)
 
-class AddToPlaylistButton(Button, VoiceExtension):
-    def __init__(self, **kwargs):
-        Button.__init__(self, **kwargs)
-        VoiceExtension.__init__(self, None)
-    
+    async def _toggle_track(self, playlist: CachedPlaylist, track: dict[str, Any], track_in_playlist: bool) -> Playlist | None:
+        """Delete the track from the playlist if it's there, insert it otherwise. Return modified playlist."""
+        if track_in_playlist:
+            index = cast(list[str], playlist.track_ids).index(str(track['id']))
+            with ym_priority(Priority.FEEDBACK):
+                res = await self.ym_client.users_playlists_delete_track(
+                    kind=f"{playlist.kind}",
+                    from_=index,
+                    to=index + 1,
+                    revision=playlist.revision or 1
+                )
+            if res:
+                services.playlists.apply(self.ym_client, playlist.kind, res, removed_at=index)
+        else:
+            with ym_priority(Priority.FEEDBACK):
+                res = await self.ym_client.users_playlists_insert_track(
+                    kind=f"{playlist.kind}",
+                    track_id=track['id'],
+                    album_id=track['albums'][0]['id'],
+                    revision=playlist.revision or 1
+                )
+            if res:
+                services.playlists.apply(self.ym_client, playlist.kind, res, inserted=str(track['id']))
+
+        return res
+
+
+class AddToPlaylistButton(Button):
     async def callback(self, interaction: Interaction):
-        if not await self.voice_check(interaction) or not interaction.guild_id:
+        if not await services.voice.voice_check(interaction) or not interaction.guild_id:
             return
 
-        if not await self.db.get_track(interaction.guild_id, 'current'):
-            await self.respond(interaction, "error", "Нет воспроизводимого трека.", delete_after=15, ephemeral=True)
+        if not await services.db.get_track(interaction.guild_id, 'current'):
+            await services.voice.respond(interaction, "error", "Нет воспроизводимого трека.", delete_after=15, ephemeral=True)
             return
 
-        if not (client := await self.init_ym_client(interaction)):
-            await self.respond(interaction, "error", "Что-то пошло не так. Попробуйте позже.", delete_after=15, ephemeral=True)
+        if not (client := await services.voice.init_ym_client(interaction)):
+            await services.voice.respond(interaction, "error", "Что-то пошло не так. Попробуйте позже.", delete_after=15, ephemeral=True)
             return
 
-        if not (vc := await self.get_voice_client(interaction)) or not vc.is_playing:
-            await self.respond(interaction, "error", "Нет воспроизводимого трека.", delete_after=15, ephemeral=True)
+        if not (vc := await services.voice.get_voice_client(interaction)) or not vc.is_playing:
+            await services.voice.respond(interaction, "error", "Нет воспроизводимого трека.", delete_after=15, ephemeral=True)
             return
 
-        if not (playlists := await client.users_playlists_list()):
-            await self.respond(interaction, "error", "У вас нет плейлистов.", delete_after=15, ephemeral=True)
+        if not (playlists := await services.playlists.get_all(client)):
+            await services.voice.respond(interaction, "error", "У вас нет плейлистов.", delete_after=15, ephemeral=True)
             return
 
         view = View(
@@ -630,28 +611,46 @@ class AddToPlaylistButton(Button, VoiceExtension):
         await interaction.respond(view=view, ephemeral=True, delete_after=360)
 
 
-class MenuView(View, VoiceExtension):
-    
-    def __init__(self, ctx: ApplicationContext | Interaction | RawReactionActionEvent, *items: Item, timeout: float | None = 3600, disable_on_timeout: bool = False):
-        View.__init__(self, *items, timeout=timeout, disable_on_timeout=disable_on_timeout)
-        VoiceExtension.__init__(self, None)
+class MenuView(View):
+    """Menu of the player. Components have stable custom ids and are handled by the instance registered
+    with `persistent()` at startup, so menus keep working after restart. Instances created with a context
+    only render the state of the guild and are not stored for callbacks.
+    """
+
+    def __init__(self, ctx: ApplicationContext | Interaction | RawReactionActionEvent | None = None, *items: Item):
+        View.__init__(self, *items, timeout=None, store=ctx is None)
         self.ctx = ctx
 
-        self.repeat_button = ToggleButton(self, style=ButtonStyle.secondary, emoji='🔂', row=0, custom_id='repeat')
-        self.shuffle_button = ToggleButton(self, style=ButtonStyle.secondary, emoji='🔀', row=0, custom_id='shuffle')
-        self.play_pause_button = PlayPauseButton(style=ButtonStyle.primary, emoji='⏯', row=0)
+        self.repeat_button = ToggleButton(style=ButtonStyle.secondary, emoji='🔂', row=0, custom_id='repeat')
+        self.shuffle_button = ToggleButton(style=ButtonStyle.secondary, emoji='🔀', row=0, custom_id='shuffle')
+        self.play_pause_button = PlayPauseButton(style=ButtonStyle.primary, emoji='⏯', row=0, custom_id='play_pause')
         self.next_button = SwitchTrackButton(style=ButtonStyle.primary, emoji='⏭', row=0, custom_id='next')
         self.prev_button = SwitchTrackButton(style=ButtonStyle.primary, emoji='⏮', row=0, custom_id='previous')
 
-        self.like_button = ReactionButton(self, style=ButtonStyle.secondary, emoji='❤️', row=1, custom_id='like')
-        self.dislike_button = ReactionButton(self, style=ButtonStyle.secondary, emoji='💔', row=1, custom_id='dislike')
-        self.lyrics_button = LyricsButton(style=ButtonStyle.secondary, emoji='📋', row=1)
-        self.add_to_playlist_button = AddToPlaylistButton(style=ButtonStyle.secondary, emoji='📁', row=1)
-        self.vibe_button = MyVibeButton(style=ButtonStyle.secondary, emoji='🌊', row=1)
-        self.vibe_settings_button = MyVibeSettingsButton(style=ButtonStyle.success, emoji='🛠', row=1)
+        self.like_button = ReactionButton(style=ButtonStyle.secondary, emoji='❤️', row=1, custom_id='like')
+        self.dislike_button = ReactionButton(style=ButtonStyle.secondary, emoji='💔', row=1, custom_id='dislike')
+        self.lyrics_button = LyricsButton(style=ButtonStyle.secondary, emoji='📋', row=1, custom_id='lyrics')
+        self.add_to_playlist_button = AddToPlaylistButton(style=ButtonStyle.secondary, emoji='📁', row=1, custom_id='add_to_playlist')
+        self.vibe_button = MyVibeButton(style=ButtonStyle.secondary, emoji='🌊', row=1, custom_id='vibe')
+        self.vibe_settings_button = MyVibeSettingsButton(style=ButtonStyle.success, emoji='🛠', row=1, custom_id='vibe_settings')
         
         self.current_vibe_button: MyVibeButton | MyVibeSettingsButton = self.vibe_button
 
+    @classmethod
+    def persistent(cls) -> Self:
+        """Create the view that handles clicks on all menu messages. Register it with `bot.add_view`."""
+        view = cls()
+        view.vibe_settings_button.row = 2  # Only one of vibe buttons is shown, layout doesn't matter here
+
+        for item in (
+            view.repeat_button, view.prev_button, view.play_pause_button, view.next_button, view.shuffle_button,
+            view.like_button, view.dislike_button, view.lyrics_button, view.add_to_playlist_button,
+            view.vibe_button, view.vibe_settings_button
+        ):
+            view.add_item(item)
+
+        return view
+
     async def init(self, *, disable: bool = False) -> Self:
         await self.update(disable=disable)
 
@@ -669,12 +668,19 @@ class MenuView(View, VoiceExtension):
         return self
 
     async def update(self, *, disable: bool = False) -> Self:
-        if not self.ctx.guild_id:
+        if not self.ctx or not self.ctx.guild_id:
             return self
         
         self.enable_all_items()
+        deadline = asyncio.get_running_loop().time() + MENU_UPDATE_TIMEOUT
 
-        self.guild = await self.db.get_guild(self.ctx.guild_id, projection={
+        reactions: asyncio.Future[tuple[set[str], set[str]]] | None = None
+        if not isinstance(self.ctx, RawReactionActionEvent) and self.ctx.user and len(cast(VoiceChannel, self.ctx.channel).members) == 2:
+            # Looked up while the guild is loading and cancelled if the guild doesn't allow them.
+            # The user's own client is used, so nothing is read from the guild and no errors are sent.
+            reactions = asyncio.ensure_future(_get_reactions(self.ctx.user.id))
+
+        self.guild = await services.db.get_guild(self.ctx.guild_id, projection={
             'repeat': 1, 'shuffle': 1, 'current_track': 1, 'current_viber_id': 1, 'vibing': 1, 'single_token_uid': 1
         })
 
@@ -689,24 +695,25 @@ class MenuView(View, VoiceExtension):
             self.shuffle_button.style = ButtonStyle.secondary
 
         current_track = self.guild['current_track']
-
-        if not isinstance(self.ctx, RawReactionActionEvent) \
-           and len(cast(VoiceChannel, self.ctx.channel).members) == 2 \
-           and not self.guild['single_token_uid']:
-
-            if current_track and str(current_track['id']) in [str(like.id) for like in await self.get_reacted_tracks(self.ctx, 'like')]:
-                self.like_button.style = ButtonStyle.success
+        self.like_button.style = ButtonStyle.secondary
+        self.dislike_button.style = ButtonStyle.secondary
+
+        if reactions and current_track and not self.guild['single_token_uid']:
+            try:
+                # Shielded so the reactions cache is still filled for the next update
+                likes, dislikes = await asyncio.wait_for(
+                    asyncio.shield(reactions), max(0, deadline - asyncio.get_running_loop().time())
+                )
+            except asyncio.TimeoutError:
+                logging.info("[MENU] Reactions lookup timed out, using default styles")
             else:
-                self.like_button.style = ButtonStyle.secondary
+                if str(current_track['id']) in likes:
+                    self.like_button.style = ButtonStyle.success
+                if str(current_track['id']) in dislikes:
+                    self.dislike_button.style = ButtonStyle.success
 
-            if current_track and str(current_track['id']) in [str(dislike.id) for dislike in await self.get_reacted_tracks(self.ctx, 'dislike')]:
-                self.dislike_button.style = ButtonStyle.success
-            else:
-                self.dislike_button.style = ButtonStyle.secondary
-
-        else:
-            self.like_button.style = ButtonStyle.secondary
-            self.dislike_button.style = ButtonStyle.secondary
+        elif reactions:
+            reactions.cancel()
 
         if not current_track:
             self.lyrics_button.disabled = True
@@ -728,28 +735,18 @@ class MenuView(View, VoiceExtension):
 
         if disable:
             self.disable_all_items()
-        
-        if self.timeout:
-            self.__timeout_expiry = monotonic() + self.timeout
 
         return self
-    
-    async def on_timeout(self) -> None:
-        logging.debug('[MENU] Menu timed out. Deleting menu message')
-        if not self.ctx.guild_id:
-            return
 
-        if self.guild['current_menu']:
-            await self.db.update(self.ctx.guild_id, {
-                'current_menu': None, 'repeat': False, 'shuffle': False,
-                'previous_tracks': [], 'next_tracks': [], 'votes': {},
-                'vibing': False, 'current_viber_id': None
-            })
+async def _get_reactions(uid: int) -> tuple[set[str], set[str]]:
+    """Return ids of liked and disliked tracks of the user. Empty sets if the user has no valid token or lookup failed."""
+    if not (client := await services.voice.get_user_ym_client(uid)):
+        return set(), set()
 
-            if (message := await self.get_menu_message(self.ctx, self.guild['current_menu'])):
-                await message.delete()
-                logging.debug('[MENU] Successfully deleted menu message')
-            else:
-                logging.debug('[MENU] No menu message found')
+    try:
+        likes, dislikes = await asyncio.gather(services.reactions.get(client, 'like'), services.reactions.get(client, 'dislike'))
+    except yandex_music.exceptions.YandexMusicError as e:
+        logging.info(f"[MENU] Failed to get reactions of user {uid}: {e}")
+        return set(), set()
 
-        self.stop()
+    return likes or set(), dislikes or set()
@@ -4,20 +4,22 @@ from typing import Any
 from discord.ui import View, Button, Item
 from discord import ApplicationContext, ButtonStyle, Interaction, Embed, HTTPException
 
-from MusicBot.cogs.utils.voice_extension import VoiceExtension
+from MusicBot.cogs.utils.services import services
 
-def generate_queue_embed(page: int, tracks_list: list[dict[str, Any]]) -> Embed:
-    count = 15 * page
-    length = len(tracks_list)
+QUEUE_PAGE_SIZE = 15
+
+def generate_queue_embed(page: int, tracks: list[dict[str, Any]], total: int) -> Embed:
+    """Generate queue embed for the page. `tracks` are the tracks of this page only."""
+    count = QUEUE_PAGE_SIZE * page
 
     embed = Embed(
-        title=f"Всего: {length}",
+        title=f"Всего: {total}",
         color=0xfed42b,
     )
     embed.set_author(name="Очередь треков")
-    embed.set_footer(text=f"Страница {page + 1} из {ceil(length / 15)}")
+    embed.set_footer(text=f"Страница {page + 1} из {max(1, ceil(total / QUEUE_PAGE_SIZE))}")
 
-    for i, track in enumerate(tracks_list[count:count + 15], start=1 + count):
+    for i, track in enumerate(tracks, start=1 + count):
         if track['duration_ms']:
             duration_m = track['duration_ms'] // 60000
             duration_s = ceil(track['duration_ms'] / 1000) - duration_m * 60
@@ -25,15 +27,61 @@ def generate_queue_embed(page: int, tracks_list: list[dict[str, Any]]) -> Embed:
 
     return embed
 
+def paginate_lyrics(text: str, page_size: int = 1500) -> list[str]:
+    """Split lyrics into pages of at most `page_size` characters. Stanzas are kept on one page when they fit."""
+    pages: list[str] = []
+    page = ''
+
+    for stanza in text.strip().split('\n\n'):
+        # Stanzas longer than a page are split by lines, lines longer than a page are split by words
+        parts = [stanza] if len(stanza) <= page_size else [
+            chunk for line in stanza.split('\n') for chunk in _split_line(line, page_size)
+        ]
+
+        for i, part in enumerate(parts):
+            separator = '\n' if i else '\n\n'
+            if page and len(page) + len(separator) + len(part) > page_size:
+                pages.append(page)
+                page = ''
+            page = f"{page}{separator}{part}" if page else part
+
+    if page:
+        pages.append(page)
+
+    return pages
+
+def _split_line(line: str, size: int) -> list[str]:
+    """Split the line into chunks of at most `size` characters, at whitespace when possible."""
+    chunks: list[str] = []
+
+    while len(line) > size:
+        if (cut := line.rfind(' ', 0, size + 1)) <= 0:
+            cut = size
+        chunks.append(line[:cut].rstrip())
+        line = line[cut:].lstrip()
+
+    return chunks + [line]
+
+def generate_lyrics_embed(title: str, pages: list[str], page: int) -> Embed:
+    embed = Embed(
+        title=title,
+        description=pages[page],
+        color=0xfed42b,
+    )
+    embed.set_author(name="Текст песни")
+    if len(pages) > 1:
+        embed.set_footer(text=f"Страница {page + 1} из {len(pages)}")
+
+    return embed
+
 class QueueNextButton(Button):
     def __init__(self, root:' QueueView', **kwargs):
         Button.__init__(self, **kwargs)
         self.root = root
 
     async def callback(self, interaction: Interaction) -> None:
-        self.root.page += 1
-        self.root.update()
-        embed = generate_queue_embed(self.root.page, self.root.tracks)
+        await self.root.load(self.root.page + 1)
+        embed = generate_queue_embed(self.root.page, self.root.tracks, self.root.total)
         await interaction.edit(embed=embed, view=self.root)
 
 class QueuePrevButton(Button):
@@ -42,50 +90,53 @@ class QueuePrevButton(Button):
         self.root = root
 
     async def callback(self, interaction: Interaction) -> None:
-        self.root.page -= 1
-        self.root.update()
-        embed = generate_queue_embed(self.root.page, self.root.tracks)
+        await self.root.load(self.root.page - 1)
+        embed = generate_queue_embed(self.root.page, self.root.tracks, self.root.total)
         await interaction.edit(embed=embed, view=self.root)
 
-class QueueView(View, VoiceExtension):
+class QueueView(View):
+    """Pages through the queue. Only the tracks of the current page are kept, other pages are read on demand."""
+
     def __init__(
         self,
         ctx: ApplicationContext | Interaction,
         tracks: list[dict[str, Any]],
+        total: int,
         *items: Item,
         timeout: float | None = 360,
         disable_on_timeout: bool = False
     ):
         View.__init__(self, *items, timeout=timeout, disable_on_timeout=disable_on_timeout)
-        VoiceExtension.__init__(self, None)
-
         self.ctx = ctx
         self.tracks = tracks
+        self.total = total
         self.page = 0
 
         self.next_button = QueueNextButton(self, style=ButtonStyle.primary, emoji='▶️')
         self.prev_button = QueuePrevButton(self, style=ButtonStyle.primary, emoji='◀️', disabled=True)
-        
-        if not self.tracks[15:]:
-            self.next_button.disabled = True
-
-        self.prev_button.disabled = True
+        self.update()
 
         self.add_item(self.prev_button)
         self.add_item(self.next_button)
 
-    def update(self):
-        count = 15 * self.page
+    async def load(self, page: int) -> None:
+        """Read the page from the database. The last page is shown if the queue got shorter."""
+        if not self.ctx.guild_id:
+            return
+
+        self.tracks, self.total = await services.db.get_tracks_page(self.ctx.guild_id, 'next', QUEUE_PAGE_SIZE * page, QUEUE_PAGE_SIZE)
+        last_page = max(ceil(self.total / QUEUE_PAGE_SIZE) - 1, 0)
 
-        if self.tracks[15:]:
-            self.next_button.disabled = False
-        else:
-            self.next_button.disabled = True
+        if page > last_page:
+            page = last_page
+            self.tracks, self.total = await services.db.get_tracks_page(self.ctx.guild_id, 'next', QUEUE_PAGE_SIZE * page, QUEUE_PAGE_SIZE)
 
-        if self.tracks[:count]:
-            self.prev_button.disabled = False
-        else:
-            self.prev_button.disabled = True
+        self.page = page
+        self.update()
+
+    def update(self):
+        self.next_button.disabled = QUEUE_PAGE_SIZE * (self.page + 1) >= self.total
+        self.prev_button.disabled = self.page == 0
     
     async def on_timeout(self) -> None:
         try:
@@ -93,3 +144,58 @@ class QueueView(View, VoiceExtension):
         except HTTPException:
             pass
         self.stop()
+
+class LyricsNextButton(Button):
+    def __init__(self, root: 'LyricsView', **kwargs):
+        Button.__init__(self, **kwargs)
+        self.root = root
+
+    async def callback(self, interaction: Interaction) -> None:
+        self.root.page += 1
+        self.root.update()
+        embed = generate_lyrics_embed(self.root.title, self.root.pages, self.root.page)
+        await interaction.edit(embed=embed, view=self.root)
+
+class LyricsPrevButton(Button):
+    def __init__(self, root: 'LyricsView', **kwargs):
+        Button.__init__(self, **kwargs)
+        self.root = root
+
+    async def callback(self, interaction: Interaction) -> None:
+        self.root.page -= 1
+        self.root.update()
+        embed = generate_lyrics_embed(self.root.title, self.root.pages, self.root.page)
+        await interaction.edit(embed=embed, view=self.root)
+
+class LyricsView(View):
+    def __init__(
+        self,
+        title: str,
+        pages: list[str],
+        *items: Item,
+        timeout: float | None = 360,
+        disable_on_timeout: bool = False
+    ):
+        View.__init__(self, *items, timeout=timeout, disable_on_timeout=disable_on_timeout)
+        self.title = title
+        self.pages = pages
+        self.page = 0
+
+        self.next_button = LyricsNextButton(self, style=ButtonStyle.primary, emoji='▶️')
+        self.prev_button = LyricsPrevButton(self, style=ButtonStyle.primary, emoji='◀️')
+        self.update()
+
+        if len(self.pages) > 1:
+            self.add_item(self.prev_button)
+            self.add_item(self.next_button)
+
+    def update(self):
+        self.next_button.disabled = self.page >= len(self.pages) - 1
+        self.prev_button.disabled = self.page <= 0
+
+    async def on_timeout(self) -> None:
+        try:
+            await super().on_timeout()
+        except HTTPException:
+            pass
+        self.stop()
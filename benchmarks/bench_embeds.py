@@ -0,0 +1,179 @@
+"""Offline benchmark for `generate_item_embed`.
+
+Runs embed generation for every item type against recorded fixtures in `benchmarks/fixtures`
+and reports timings and memory allocations for each stage:
+
+- deserialize: `de_json` of the fixture into yandex_music models.
+- cover_fetch: cover download (served from `fixtures/covers` instead of the network).
+- color: average color computation.
+- embed_build: embed generation with color computation excluded.
+- total: deserialization and full embed generation.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_embeds [-n ITERATIONS] [-k KIND [KIND ...]]
+"""
+
+import os
+
+# Required on import by MusicBot.cogs.utils and MusicBot.database. The database is never queried.
+os.environ.setdefault('EXPLICIT_EID', '0')
+os.environ.setdefault('MONGO_URI', 'mongodb://localhost:27017')
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from statistics import mean, median
+from typing import Any, Awaitable, Callable
+
+from yandex_music import ClientAsync as YMClient, Track, Album, Artist, Playlist
+
+from MusicBot.cogs.utils import embeds
+
+FIXTURES = Path(__file__).parent / 'fixtures'
+KINDS: dict[str, type[Track | Album | Artist | Playlist]] = {
+    'track': Track,
+    'album': Album,
+    'artist': Artist,
+    'playlist': Playlist,
+    'likes': Track
+}
+
+@dataclass
+class StageResult:
+    kind: str
+    stage: str
+    timings: list[float] = field(default_factory=list)
+    peak: int = 0
+    retained: int = 0
+
+async def _fetch_local_image(url: str) -> bytes:
+    """Replacement for `embeds._fetch_image`. Resolve fixture cover url to a local file."""
+    name = url.split('/fixture/')[1].split('/')[0]
+    return (FIXTURES / 'covers' / f'{name}.jpg').read_bytes()
+
+async def _constant_color(url: str) -> int:
+    return 0x000
+
+def _load(kind: str) -> Any:
+    with open(FIXTURES / f'{kind}.json', encoding='utf-8') as f:
+        return json.load(f)
+
+def _deserialize(kind: str, data: Any, client: YMClient) -> Track | Album | Artist | Playlist | list[Track]:
+    if kind == 'likes':
+        return Track.de_list(data, client)  # type: ignore
+    return KINDS[kind].de_json(data, client)  # type: ignore
+
+async def _collect_cover_urls(item: Track | Album | Artist | Playlist | list[Track]) -> list[str]:
+    """Run embed generation once and record the urls it tries to fetch."""
+    urls: list[str] = []
+
+    async def recorder(url: str) -> bytes:
+        urls.append(url)
+        return await _fetch_local_image(url)
+
+    embeds._fetch_image = recorder
+    await embeds.generate_item_embed(item)
+    embeds._fetch_image = _fetch_local_image
+    return urls
+
+async def _measure(
+    result: StageResult,
+    func: Callable[[], Awaitable[Any] | Any],
+    iterations: int
+) -> StageResult:
+    """Measure `func` timings over `iterations` runs, then allocations in a separate traced pass."""
+
+    async def call() -> None:
+        res = func()
+        if asyncio.iscoroutine(res):
+            await res
+
+    await call()  # Warm up
+
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await call()
+        result.timings.append(time.perf_counter() - start)
+
+    traced_runs = min(iterations, 10)
+    tracemalloc.start()
+    for _ in range(traced_runs):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await call()
+        after, peak = tracemalloc.get_traced_memory()
+        result.peak += peak - before
+        result.retained += after - before
+    tracemalloc.stop()
+
+    result.peak //= traced_runs
+    result.retained //= traced_runs
+    return result
+
+async def bench_kind(kind: str, iterations: int) -> list[StageResult]:
+    client = YMClient(report_unknown_fields=False)
+    data = _load(kind)
+    item = _deserialize(kind, data, client)
+    results = []
+
+    results.append(await _measure(
+        StageResult(kind, 'deserialize'), lambda: _deserialize(kind, data, client), iterations
+    ))
+
+    for url in await _collect_cover_urls(item):
+        image = await _fetch_local_image(url)
+        results.append(await _measure(
+            StageResult(kind, 'cover_fetch'), lambda: embeds._fetch_image(url), iterations
+        ))
+        results.append(await _measure(
+            StageResult(kind, 'color'), lambda: embeds._get_average_color(image), iterations
+        ))
+
+    get_color = embeds._get_average_color_from_url
+    embeds._get_average_color_from_url = _constant_color
+    results.append(await _measure(
+        StageResult(kind, 'embed_build'), lambda: embeds.generate_item_embed(item), iterations
+    ))
+    embeds._get_average_color_from_url = get_color
+
+    results.append(await _measure(
+        StageResult(kind, 'total'),
+        lambda: embeds.generate_item_embed(_deserialize(kind, data, client)),
+        iterations
+    ))
+    return results
+
+def _report(results: list[StageResult]) -> None:
+    header = f"{'kind':<10}{'stage':<13}{'mean ms':>10}{'median ms':>11}{'p95 ms':>10}{'peak KiB':>11}{'retained KiB':>14}"
+    print(header)
+    print('-' * len(header))
+
+    for res in results:
+        timings = sorted(res.timings)
+        p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+        print(
+            f"{res.kind:<10}{res.stage:<13}"
+            f"{mean(timings) * 1000:>10.3f}{median(timings) * 1000:>11.3f}{p95 * 1000:>10.3f}"
+            f"{res.peak / 1024:>11.1f}{res.retained / 1024:>14.1f}"
+        )
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Offline embed generation benchmark.")
+    parser.add_argument('-n', '--iterations', type=int, default=50, help="Runs per stage. Defaults to 50.")
+    parser.add_argument('-k', '--kind', nargs='+', choices=list(KINDS), default=list(KINDS), help="Item types to benchmark.")
+    args = parser.parse_args()
+
+    embeds._fetch_image = _fetch_local_image
+
+    results = []
+    for kind in args.kind:
+        results.extend(await bench_kind(kind, args.iterations))
+
+    _report(results)
+
+if __name__ == '__main__':
+    asyncio.run(main())
@@ -0,0 +1,5 @@
+import os
+
+# Required on import by MusicBot.cogs.utils and MusicBot.database. The database is never queried.
+os.environ.setdefault('EXPLICIT_EID', '0')
+os.environ.setdefault('MONGO_URI', 'mongodb://localhost:27017')
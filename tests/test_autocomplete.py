@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+
+from MusicBot.cogs.utils.autocomplete import AutocompleteEngine
+
+class AutocompleteEngineTest(unittest.IsolatedAsyncioTestCase):
+    async def test_returns_fetched_suggestions(self):
+        engine = AutocompleteEngine()
+
+        async def fetch(value: str) -> list[str]:
+            return [f"{value} 1", f"{value} 2"]
+
+        self.assertEqual(await engine.suggest('key', 'abc', fetch), ['abc 1', 'abc 2'])
+
+    async def test_exhaustive_result_is_filtered_without_fetching(self):
+        engine = AutocompleteEngine()
+        calls: list[str] = []
+
+        async def fetch(value: str) -> list[str]:
+            calls.append(value)
+            return ['Rock', 'Rock and Roll', 'Jazz']
+
+        await engine.suggest('key', 'r', fetch, exhaustive=True)
+        self.assertEqual(await engine.suggest('key', 'rock a', fetch, exhaustive=True), ['Rock and Roll'])
+        self.assertEqual(calls, ['r'])
+
+    async def test_superseded_fetch_is_cancelled(self):
+        engine = AutocompleteEngine(deadline=1)
+        cancelled = asyncio.Event()
+
+        async def slow_fetch(value: str) -> list[str]:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+            return []
+
+        async def fetch(value: str) -> list[str]:
+            return [value]
+
+        first = asyncio.create_task(engine.suggest('key', 'a', slow_fetch))
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(await engine.suggest('key', 'ab', fetch), ['ab'])
+        await asyncio.wait_for(cancelled.wait(), 1)
+        self.assertEqual(await first, ['ab'])  # Falls back to the newer result
+
+    async def test_overdue_fetch_refreshes_fallback(self):
+        engine = AutocompleteEngine(deadline=0.05)
+
+        async def fetch(value: str) -> list[str]:
+            await asyncio.sleep(0.12)
+            return ['abcdefgh']
+
+        # Every fetch is slower than the deadline and is superseded by the next keystroke
+        results = [await engine.suggest('key', 'abcdefgh'[:i], fetch) for i in range(1, 7)]
+
+        self.assertEqual(results[0], [])
+        self.assertEqual(results[-1], ['abcdefgh'])
+
+    async def test_fallback_matches_current_query(self):
+        engine = AutocompleteEngine(deadline=0.05)
+
+        async def fetch(value: str) -> list[str]:
+            return [f"{value} song"]
+
+        async def slow_fetch(value: str) -> list[str]:
+            await asyncio.sleep(1)
+            return []
+
+        await engine.suggest('key', 'abc', fetch)
+
+        self.assertEqual(await engine.suggest('key', 'abc s', slow_fetch), ['abc song'])
+        self.assertEqual(await engine.suggest('key', 'xyz', slow_fetch), [])
+
+    async def test_older_result_does_not_replace_newer_one(self):
+        engine = AutocompleteEngine(deadline=0.05)
+        release = asyncio.Event()
+
+        async def stalled_fetch(value: str) -> list[str]:
+            await release.wait()
+            return [f"{value}!"]
+
+        async def fetch(value: str) -> list[str]:
+            return [f"{value}!"]
+
+        await engine.suggest('key', 'a', stalled_fetch)  # Becomes overdue and is left running
+        await asyncio.sleep(0.06)
+        self.assertEqual(await engine.suggest('key', 'ab', fetch), ['ab!'])
+
+        release.set()
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(engine._fallback(engine._states.get('key'), 'a'), ['ab!'])  # type: ignore
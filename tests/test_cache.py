@@ -0,0 +1,45 @@
+import unittest
+from unittest.mock import patch
+
+from MusicBot.cogs.utils.cache import TTLCache
+
+class TTLCacheTest(unittest.TestCase):
+    def test_get_returns_stored_value(self):
+        cache: TTLCache[str, int] = TTLCache('test')
+        cache.set('a', 1)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIn('a', cache)
+        self.assertIsNone(cache.get('b'))
+
+    def test_entries_expire(self):
+        cache: TTLCache[str, int] = TTLCache('test', ttl=10)
+
+        with patch('MusicBot.cogs.utils.cache.monotonic', return_value=100):
+            cache.set('a', 1)
+            cache.set('b', 2, ttl=30)
+
+        with patch('MusicBot.cogs.utils.cache.monotonic', return_value=115):
+            self.assertIsNone(cache.get('a'))
+            self.assertNotIn('a', cache)
+            self.assertEqual(cache.get('b'), 2)
+
+        self.assertEqual(len(cache), 1)  # Expired entry is dropped on access
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache: TTLCache[str, int] = TTLCache('test', max_size=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_pop_missing_key(self):
+        cache: TTLCache[str, int] = TTLCache('test')
+        cache.set('a', 1)
+
+        self.assertEqual(cache.pop('a'), 1)
+        self.assertIsNone(cache.pop('a'))
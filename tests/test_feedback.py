@@ -0,0 +1,79 @@
+import asyncio
+import unittest
+
+from yandex_music.exceptions import BadRequestError, NetworkError
+
+from MusicBot.cogs.utils.feedback import FeedbackQueue
+
+class FeedbackQueueTest(unittest.IsolatedAsyncioTestCase):
+    async def wait_idle(self, queue: FeedbackQueue) -> None:
+        while queue._workers:
+            await asyncio.gather(*queue._workers.values())
+
+    async def test_events_are_delivered_in_order_per_key(self):
+        queue = FeedbackQueue()
+        delivered: list[str] = []
+
+        def event(name: str, delay: float):
+            async def send() -> None:
+                await asyncio.sleep(delay)
+                delivered.append(name)
+            return send
+
+        queue.put('guild', event('started', 0.02))
+        queue.put('guild', event('finished', 0))
+        await self.wait_idle(queue)
+
+        self.assertEqual(delivered, ['started', 'finished'])
+
+    async def test_network_errors_are_retried(self):
+        queue = FeedbackQueue(retries=3, backoff=0.001)
+        attempts = 0
+
+        async def send() -> None:
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise NetworkError('failed')
+
+        queue.put('guild', send)
+        await self.wait_idle(queue)
+
+        self.assertEqual(attempts, 3)
+
+    async def test_no_backoff_after_last_attempt(self):
+        queue = FeedbackQueue(retries=2, backoff=0.05)  # Backoff after the last attempt would be 0.1s
+        delivered: list[str] = []
+
+        async def failing() -> None:
+            raise NetworkError('failed')
+
+        async def send() -> None:
+            delivered.append('next')
+
+        queue.put('guild', failing)
+        queue.put('guild', send)
+        await asyncio.wait_for(self.wait_idle(queue), 0.09)
+
+        self.assertEqual(delivered, ['next'])
+
+    async def test_rejected_event_is_dropped(self):
+        queue = FeedbackQueue(retries=3, backoff=0.001)
+        attempts = 0
+        delivered: list[str] = []
+
+        async def rejected() -> None:
+            nonlocal attempts
+            attempts += 1
+            raise BadRequestError('rejected')
+
+        async def send() -> None:
+            delivered.append('next')
+
+        queue.put('guild', rejected)
+        queue.put('guild', send)
+        await self.wait_idle(queue)
+
+        self.assertEqual(attempts, 1)
+        self.assertEqual(delivered, ['next'])
+        self.assertFalse(queue._queues)
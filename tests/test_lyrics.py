@@ -0,0 +1,40 @@
+import unittest
+
+from MusicBot.ui.other import _split_line, paginate_lyrics
+
+def _characters(text: str) -> str:
+    return "".join(text.split())
+
+class PaginateLyricsTest(unittest.TestCase):
+    def test_short_lyrics_are_one_page(self):
+        self.assertEqual(paginate_lyrics("line 1\nline 2\n\nline 3"), ["line 1\nline 2\n\nline 3"])
+
+    def test_stanzas_are_kept_on_one_page(self):
+        stanza = "\n".join(["la la la"] * 5)
+        pages = paginate_lyrics("\n\n".join([stanza] * 3), page_size=len(stanza) * 2 + 2)
+
+        self.assertEqual(pages, [f"{stanza}\n\n{stanza}", stanza])
+
+    def test_long_stanza_is_split_by_lines(self):
+        stanza = "\n".join(f"line {i}" for i in range(20))
+        pages = paginate_lyrics(stanza, page_size=30)
+
+        self.assertTrue(all(len(page) <= 30 for page in pages))
+        self.assertEqual("\n".join(pages), stanza)
+
+    def test_long_line_keeps_all_text(self):
+        text = "intro\n\n" + " ".join(f"word{i}" for i in range(100)) + "\n" + "x" * 45 + "\n\nend"
+        pages = paginate_lyrics(text, page_size=20)
+
+        self.assertTrue(all(len(page) <= 20 for page in pages))
+        self.assertEqual(_characters("".join(pages)), _characters(text))
+
+class SplitLineTest(unittest.TestCase):
+    def test_short_line_is_not_split(self):
+        self.assertEqual(_split_line("short line", 20), ["short line"])
+
+    def test_split_at_whitespace(self):
+        self.assertEqual(_split_line("aaa bbb ccc ddd", 8), ["aaa bbb", "ccc ddd"])
+
+    def test_split_word_longer_than_size(self):
+        self.assertEqual(_split_line("abcdefghij", 4), ["abcd", "efgh", "ij"])
@@ -0,0 +1,95 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from typing import Any
+
+import discord
+
+from MusicBot.cogs.utils.menu_edits import MenuEditScheduler
+
+class FakeMessage:
+    def __init__(self, message_id: int = 1, error: Exception | None = None) -> None:
+        self.id = message_id
+        self.error = error
+        self.edits: list[dict[str, Any]] = []
+
+    async def edit(self, **fields: Any) -> None:
+        if self.error:
+            raise self.error
+        self.edits.append(fields)
+
+class MenuEditSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_lone_edit_is_sent_immediately(self):
+        scheduler = MenuEditScheduler(window=10)
+        message = FakeMessage()
+
+        self.assertTrue(await asyncio.wait_for(scheduler.schedule(1, message, content='a'), 0.1))
+        self.assertEqual(message.edits, [{'content': 'a'}])
+
+    async def test_edits_within_window_are_merged(self):
+        scheduler = MenuEditScheduler(window=0.02)
+        message = FakeMessage()
+        embed = discord.Embed(title='new')
+
+        first = scheduler.schedule(1, message, content='a')
+        await asyncio.sleep(0)  # First edit is sent
+        second = scheduler.schedule(1, message, content='b')
+        third = scheduler.schedule(1, message, embed=embed)
+
+        self.assertIs(second, third)
+        self.assertTrue(await asyncio.wait_for(asyncio.gather(first, third), 0.1))
+        self.assertEqual(message.edits, [{'content': 'a'}, {'content': 'b', 'embed': embed}])
+
+    async def test_unchanged_fields_are_not_sent(self):
+        scheduler = MenuEditScheduler(window=0)
+        message = FakeMessage()
+
+        await scheduler.schedule(1, message, content='a', embed=discord.Embed(title='a'))
+        await scheduler.schedule(1, message, content='b', embed=discord.Embed(title='a'))
+        await scheduler.schedule(1, message, content='b')
+
+        self.assertEqual([list(edit) for edit in message.edits], [['content', 'embed'], ['content']])
+
+    async def test_interaction_edit_supersedes_pending_edit(self):
+        scheduler = MenuEditScheduler(window=0.02)
+        message = FakeMessage()
+
+        await scheduler.schedule(1, message, content='a')
+        pending = scheduler.schedule(1, message, content='old')
+        scheduler.rendered(1, message.id, content='new')
+
+        self.assertTrue(await asyncio.wait_for(pending, 0.1))
+        await asyncio.sleep(0.03)
+        self.assertEqual(message.edits, [{'content': 'a'}])
+
+    async def test_interaction_edit_keeps_other_pending_fields(self):
+        scheduler = MenuEditScheduler(window=0.02)
+        message = FakeMessage()
+
+        await scheduler.schedule(1, message, content='a')
+        pending = scheduler.schedule(1, message, content='old', embed=discord.Embed(title='b'))
+        scheduler.rendered(1, message.id, content='new')
+
+        self.assertTrue(await asyncio.wait_for(pending, 0.1))
+        self.assertEqual(list(message.edits[-1]), ['embed'])
+
+    async def test_edits_of_replaced_message_are_dropped(self):
+        scheduler = MenuEditScheduler(window=0.02)
+        old, new = FakeMessage(1), FakeMessage(2)
+
+        await scheduler.schedule(1, old, content='a')
+        dropped = scheduler.schedule(1, old, content='b')
+        sent = scheduler.schedule(1, new, content='c')
+
+        self.assertFalse(await dropped)
+        self.assertTrue(await asyncio.wait_for(sent, 0.1))
+        self.assertEqual(old.edits, [{'content': 'a'}])
+        self.assertEqual(new.edits, [{'content': 'c'}])
+
+    async def test_deleted_message_is_reported(self):
+        not_found: list[tuple[int, int]] = []
+        scheduler = MenuEditScheduler(on_not_found=lambda gid, mid: not_found.append((gid, mid)))
+        message = FakeMessage(5, discord.NotFound(SimpleNamespace(status=404, reason='Not Found'), 'Unknown Message'))
+
+        self.assertFalse(await asyncio.wait_for(scheduler.schedule(1, message, content='a'), 0.1))
+        self.assertEqual(not_found, [(1, 5)])
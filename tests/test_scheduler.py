@@ -0,0 +1,65 @@
+import asyncio
+import unittest
+
+from MusicBot.cogs.utils.scheduler import Priority, RequestScheduler, RequestShedError, request_priority, ym_priority
+
+class RequestSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    async def test_burst_is_not_delayed(self):
+        scheduler = RequestScheduler(rate=1, burst=5)
+
+        await asyncio.wait_for(asyncio.gather(*(scheduler.acquire('token') for _ in range(5))), 0.1)
+
+    async def test_tokens_are_limited_separately(self):
+        scheduler = RequestScheduler(rate=1, burst=1)
+        await scheduler.acquire('a')
+
+        await asyncio.wait_for(scheduler.acquire('b'), 0.1)
+
+    async def test_waiting_requests_are_released_by_priority(self):
+        scheduler = RequestScheduler(rate=50, burst=1, shed_from=Priority.AUTOCOMPLETE, max_wait=10)
+        await scheduler.acquire('token')
+        order: list[Priority] = []
+
+        async def acquire(priority: Priority) -> None:
+            with ym_priority(priority):
+                await scheduler.acquire('token')
+            order.append(priority)
+
+        tasks = []
+        for priority in (Priority.AUTOCOMPLETE, Priority.EMBEDS, Priority.PLAYBACK, Priority.FEEDBACK):
+            tasks.append(asyncio.create_task(acquire(priority)))
+            await asyncio.sleep(0)  # Queue them in this order
+
+        await asyncio.wait_for(asyncio.gather(*tasks), 1)
+        self.assertEqual(order, [Priority.PLAYBACK, Priority.FEEDBACK, Priority.EMBEDS, Priority.AUTOCOMPLETE])
+
+    async def test_low_priority_requests_are_shed(self):
+        scheduler = RequestScheduler(rate=1, burst=1, max_wait=0.5)
+        await scheduler.acquire('token')
+
+        with ym_priority(Priority.AUTOCOMPLETE):
+            with self.assertRaises(RequestShedError):
+                await scheduler.acquire('token')
+
+        # Higher priority requests wait instead
+        task = asyncio.create_task(scheduler.acquire('token'))
+        await asyncio.sleep(0.05)
+        self.assertFalse(task.done())
+        task.cancel()
+
+    async def test_cancelled_waiter_does_not_use_token(self):
+        scheduler = RequestScheduler(rate=20, burst=1)
+        await scheduler.acquire('token')
+
+        cancelled = asyncio.create_task(scheduler.acquire('token'))
+        waiting = asyncio.create_task(scheduler.acquire('token'))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+
+        await asyncio.wait_for(waiting, 0.1)
+
+    def test_priority_context(self):
+        self.assertEqual(request_priority.get(), Priority.EMBEDS)
+        with ym_priority(Priority.PLAYBACK):
+            self.assertEqual(request_priority.get(), Priority.PLAYBACK)
+        self.assertEqual(request_priority.get(), Priority.EMBEDS)
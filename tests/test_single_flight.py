@@ -0,0 +1,66 @@
+import asyncio
+import unittest
+
+from MusicBot.cogs.utils.single_flight import SingleFlight
+
+class SingleFlightTest(unittest.IsolatedAsyncioTestCase):
+    async def test_concurrent_calls_share_one_call(self):
+        flights = SingleFlight('test')
+        calls = 0
+
+        async def func() -> int:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return 42
+
+        results = await asyncio.gather(*(flights.do('key', func) for _ in range(5)))
+
+        self.assertEqual(results, [42] * 5)
+        self.assertEqual(calls, 1)
+
+    async def test_different_keys_are_not_shared(self):
+        flights = SingleFlight('test')
+
+        async def func(value: int) -> int:
+            await asyncio.sleep(0.01)
+            return value
+
+        self.assertEqual(await asyncio.gather(flights.do('a', lambda: func(1)), flights.do('b', lambda: func(2))), [1, 2])
+
+    async def test_exception_is_propagated_to_every_caller(self):
+        flights = SingleFlight('test')
+
+        async def func() -> None:
+            await asyncio.sleep(0.01)
+            raise ValueError('failed')
+
+        results = await asyncio.gather(flights.do('key', func), flights.do('key', func), return_exceptions=True)
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    async def test_cancelled_caller_does_not_cancel_call(self):
+        flights = SingleFlight('test')
+
+        async def func() -> int:
+            await asyncio.sleep(0.02)
+            return 42
+
+        first = asyncio.create_task(flights.do('key', func))
+        second = asyncio.create_task(flights.do('key', func))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, 42)
+
+    async def test_key_is_released_after_call(self):
+        flights = SingleFlight('test')
+        calls = 0
+
+        async def func() -> int:
+            nonlocal calls
+            calls += 1
+            return calls
+
+        self.assertEqual(await flights.do('key', func), 1)
+        self.assertEqual(await flights.do('key', func), 2)